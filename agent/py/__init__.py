@@ -1,8 +1,10 @@
 """Agent system for autonomous task execution with web search and planning."""
-from .openai_service import OpenAIService
+from .openai_service import OpenAIService, get_openai_service
 from .agent_service import AgentService
-from .websearch_service import WebSearchService
-from .text_service import TextService
+from .websearch_service import WebSearchService, get_web_search_service
+from .text_service import TextService, get_text_service
+from .semantic_cache import SemanticCache
 from .types import State, Action, AllowedDomain
 
-__all__ = ['OpenAIService', 'AgentService', 'WebSearchService', 'TextService', 'State', 'Action', 'AllowedDomain']
+__all__ = ['OpenAIService', 'AgentService', 'WebSearchService', 'TextService', 'SemanticCache',
+           'get_openai_service', 'get_web_search_service', 'get_text_service', 'State', 'Action', 'AllowedDomain']
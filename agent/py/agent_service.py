@@ -1,26 +1,97 @@
 """Agent service for autonomous task execution."""
-import json
-from typing import Dict, Any, Optional, List
+import asyncio
+import logging
+from datetime import datetime
+from typing import AsyncIterator, Dict, Any, Optional, List
 from uuid import uuid4
 from openai.types.chat import ChatCompletionMessageParam
 
-from .openai_service import OpenAIService
-from .websearch_service import WebSearchService
-from .types import State, Action, ActionResult
+from .json_utils import json_dumps, json_loads
+from .openai_service import OpenAIService, get_openai_service
+from .websearch_service import WebSearchService, get_web_search_service
+from .semantic_cache import SemanticCache
+from .types import State, Action, ActionResult, IDoc
+
+logger = logging.getLogger(__name__)
+
+# Static system prefixes are sent first and never change, so provider-side
+# prompt caching can reuse them; per-call context follows in a second message.
+PLAN_SYSTEM_PROMPT = (
+    'Pick the next action for the conversation. '
+    'Return JSON {"_reasoning": str, "tool": str, "query": str}; '
+    'when done use tool "final_answer" with a summary as query.'
+)
+
+DESCRIBE_SYSTEM_PROMPT = 'Return only JSON with parameters for the given tool.'
+
+ANSWER_SYSTEM_PROMPT = 'Answer the user clearly using the gathered information.'
+
+# Minimum cosine similarity for a web search query to reuse earlier results
+SEARCH_CACHE_THRESHOLD = 0.95
+# Maximum number of queries kept in the semantic search cache
+SEARCH_CACHE_SIZE = 256
 
 
 class AgentService:
     """Autonomous agent with planning and web search."""
     
-    def __init__(self, state: State):
+    def __init__(
+        self,
+        state: State,
+        openai_service: Optional[OpenAIService] = None,
+        web_search_service: Optional[WebSearchService] = None
+    ):
         """Initialize agent.
         
         Args:
             state: Initial agent state.
+            openai_service: OpenAI service. Defaults to the one shared on the running loop.
+            web_search_service: Web search service. Defaults to the one shared on the running loop.
         """
-        self.openai_service = OpenAIService()
-        self.web_search_service = WebSearchService()
+        self.openai_service = openai_service or get_openai_service()
+        self.web_search_service = web_search_service or get_web_search_service()
         self.state = state
+        self._tools_key: Optional[tuple] = None
+        self._tools_csv = ''
+        self._tools_by_name: Dict[str, Dict[str, str]] = {}
+        self._search_cache = SemanticCache(
+            self.openai_service.create_embedding, SEARCH_CACHE_THRESHOLD, SEARCH_CACHE_SIZE
+        )
+        self._action_lines: List[str] = [f'- {action.description}' for action in state.actions]
+    
+    def _refresh_tools(self) -> None:
+        """Rebuild derived tool data when the state's tools change."""
+        # Keyed on content, so tools edited or replaced in place are picked up
+        key = tuple(
+            (t['name'], t.get('description'), t.get('parameters')) for t in self.state.tools
+        )
+        if key != self._tools_key:
+            self._tools_key = key
+            self._tools_csv = ', '.join(t['name'] for t in self.state.tools)
+            self._tools_by_name = {t['name']: t for t in self.state.tools}
+    
+    async def _search(self, query: str, conversation_uuid: str) -> List[IDoc]:
+        """Search the web, reusing results of semantically equivalent queries.
+        
+        Args:
+            query: Search query.
+            conversation_uuid: Conversation UUID.
+        
+        Returns:
+            List of documents.
+        """
+        try:
+            embedding, cached = await self._search_cache.lookup(query)
+        except Exception:
+            # The cache is an optimization; an embedding failure must not fail the search
+            logger.warning('Search cache lookup failed; searching directly', exc_info=True)
+            return await self.web_search_service.search(query, conversation_uuid)
+        if cached is not None:
+            return cached
+        
+        results = await self.web_search_service.search(query, conversation_uuid)
+        self._search_cache.add(embedding, results)
+        return results
     
     async def plan(self) -> Optional[Dict[str, Any]]:
         """Plan next action based on current state.
@@ -28,38 +99,27 @@ class AgentService:
         Returns:
             Next action details or None.
         """
-        system_message: ChatCompletionMessageParam = {
+        self._refresh_tools()
+        last_message = self.state.messages[-1]['content'] if self.state.messages else 'No messages'
+        context_parts = [
+            'Context:',
+            f"- Date: {datetime.now().strftime('%Y-%m-%d')}",
+            f'- Last message: "{last_message}"',
+            f'- Available tools: {self._tools_csv}',
+            f'- Actions taken: {len(self.state.actions)}',
+        ]
+        context_message: ChatCompletionMessageParam = {
             'role': 'system',
-            'content': f'''Analyze the conversation and determine the next action.
-
-Context:
-- Date: {__import__("datetime").datetime.now().isoformat()}
-- Last message: "{self.state.messages[-1]["content"] if self.state.messages else "No messages"}"
-- Available tools: {', '.join(t['name'] for t in self.state.tools)}
-- Actions taken: {len(self.state.actions)}
-
-Return JSON:
-{{
-  "_reasoning": "why this action",
-  "tool": "tool_name",
-  "query": "what to do"
-}}
-
-Or if done:
-{{
-  "_reasoning": "explanation",
-  "tool": "final_answer",
-  "query": "summary"
-}}'''
+            'content': '\n'.join(context_parts)
         }
         
         response = await self.openai_service.completion(
-            messages=[system_message],
+            messages=[{'role': 'system', 'content': PLAN_SYSTEM_PROMPT}, context_message],
             json_mode=True
         )
         
         try:
-            result = json.loads(response.choices[0].message.content or '{}')
+            result = json_loads(response.choices[0].message.content or '{}')
             return result if result.get('tool') else None
         except:
             return None
@@ -74,28 +134,28 @@ Or if done:
         Returns:
             Tool parameters.
         """
-        tool_info = next((t for t in self.state.tools if t['name'] == tool), None)
+        self._refresh_tools()
+        tool_info = self._tools_by_name.get(tool)
         if not tool_info:
             raise ValueError(f'Tool {tool} not found')
         
-        system_message: ChatCompletionMessageParam = {
+        context_parts = [
+            f'Tool: {tool_info["name"]}',
+            f'Description: {tool_info["description"]}',
+            f'Parameters: {tool_info["parameters"]}',
+        ]
+        context_message: ChatCompletionMessageParam = {
             'role': 'system',
-            'content': f'''Generate parameters for the "{tool}" tool.
-
-Tool: {tool_info["name"]}
-Description: {tool_info["description"]}
-Parameters: {tool_info["parameters"]}
-
-Respond with ONLY JSON matching the tool's parameter structure.'''
+            'content': '\n'.join(context_parts)
         }
         
         response = await self.openai_service.completion(
-            messages=[system_message],
+            messages=[{'role': 'system', 'content': DESCRIBE_SYSTEM_PROMPT}, context_message],
             json_mode=True
         )
         
         try:
-            return json.loads(response.choices[0].message.content or '{}')
+            return json_loads(response.choices[0].message.content or '{}')
         except:
             return {}
     
@@ -108,8 +168,18 @@ Respond with ONLY JSON matching the tool's parameter structure.'''
             conversation_uuid: Conversation UUID.
         """
         if tool == 'web_search':
-            query = parameters.get('query', '')
-            results = await self.web_search_service.search(query, conversation_uuid)
+            queries = parameters.get('queries') or parameters.get('query') or []
+            # The model sometimes returns a single string instead of a list
+            if isinstance(queries, str):
+                queries = [queries]
+            queries = [q.strip() for q in queries if isinstance(q, str) and q.strip()]
+            query = ', '.join(queries)
+            # Independent sub-queries are searched concurrently
+            search_results = await asyncio.gather(*[
+                self._search(q, conversation_uuid)
+                for q in queries
+            ])
+            results = [doc for docs in search_results for doc in docs]
             
             # Convert IDoc to ActionResult
             action_results = [
@@ -124,15 +194,39 @@ Respond with ONLY JSON matching the tool's parameter structure.'''
                 for doc in results
             ]
             
+            description = f'Web search for: {query}'
             self.state.documents.extend(results)
             self.state.actions.append(Action(
                 uuid=str(uuid4()),
                 name=tool,
-                parameters=json.dumps(parameters),
-                description=f'Web search for: {query}',
+                parameters=json_dumps(parameters),
+                description=description,
                 results=action_results,
                 tool_uuid=tool
             ))
+            self._action_lines.append(f'- {description}')
+    
+    def _answer_messages(self) -> List[ChatCompletionMessageParam]:
+        """Build messages for the final answer from gathered information."""
+        # Lines are appended as actions are taken; rebuild only if state was changed elsewhere
+        if len(self._action_lines) != len(self.state.actions):
+            self._action_lines = [f'- {action.description}' for action in self.state.actions]
+        context_text = '\n'.join(self._action_lines)
+        
+        user_query = self.state.messages[-1]['content'] if self.state.messages else 'No query'
+        
+        context_parts = [
+            f'User query: {user_query}',
+            '',
+            'Information gathered:',
+            context_text,
+        ]
+        context_message: ChatCompletionMessageParam = {
+            'role': 'system',
+            'content': '\n'.join(context_parts)
+        }
+        
+        return [{'role': 'system', 'content': ANSWER_SYSTEM_PROMPT}, context_message] + self.state.messages
     
     async def generate_answer(self) -> str:
         """Generate final answer based on gathered information.
@@ -140,27 +234,18 @@ Respond with ONLY JSON matching the tool's parameter structure.'''
         Returns:
             Final answer.
         """
-        context_text = '\n'.join([
-            f'- {action.description}'
-            for action in self.state.actions
-        ])
+        response = await self.openai_service.completion(messages=self._answer_messages())
         
-        user_query = self.state.messages[-1]['content'] if self.state.messages else 'No query'
-        
-        system_message: ChatCompletionMessageParam = {
-            'role': 'system',
-            'content': f'''Provide a comprehensive answer based on the gathered information.
-
-User query: {user_query}
-
-Information gathered:
-{context_text}
-
-Provide a clear, well-structured answer.'''
-        }
+        return response.choices[0].message.content or 'Unable to generate answer'
+    
+    async def stream_answer(self) -> AsyncIterator[str]:
+        """Stream final answer based on gathered information.
         
-        response = await self.openai_service.completion(
-            messages=[system_message] + self.state.messages
-        )
+        Yields:
+            Answer text fragments as they arrive.
+        """
+        stream = await self.openai_service.completion(messages=self._answer_messages(), stream=True)
         
-        return response.choices[0].message.content or 'Unable to generate answer'
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
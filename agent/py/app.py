@@ -1,9 +1,23 @@
 """Demo agent application."""
 import asyncio
+import logging
+import logging.handlers
+import queue
 from agent_service import AgentService
+from openai_service import OpenAIService
+from websearch_service import WebSearchService
 from types import State
 
 
+def setup_logging() -> logging.handlers.QueueListener:
+    """Route log records through a queue so handler I/O stays off the event loop."""
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+    logging.basicConfig(level=logging.WARNING, handlers=[logging.handlers.QueueHandler(log_queue)])
+    listener.start()
+    return listener
+
+
 async def main():
     """Run agent demo."""
     # Initialize state
@@ -14,8 +28,10 @@ async def main():
         }]
     )
     
-    # Create agent
-    agent = AgentService(state)
+    # The app owns the services, so closing them affects no other agent
+    openai_service = OpenAIService()
+    web_search_service = WebSearchService(openai_service)
+    agent = AgentService(state, openai_service, web_search_service)
     
     print('Starting agent...\n')
     
@@ -52,9 +68,18 @@ async def main():
     # Generate final answer
     if state.actions:
         print('\nGenerating final answer...')
-        answer = await agent.generate_answer()
-        print(f'\nFinal Answer:\n{answer}')
+        print('\nFinal Answer:')
+        async for fragment in agent.stream_answer():
+            print(fragment, end='', flush=True)
+        print()
+    
+    await web_search_service.aclose()
+    await openai_service.aclose()
 
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    log_listener = setup_logging()
+    try:
+        asyncio.run(main())
+    finally:
+        log_listener.stop()
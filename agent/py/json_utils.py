@@ -0,0 +1,22 @@
+"""JSON helpers backed by orjson when it is installed."""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON from text or raw bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data: Any) -> str:
+    """Serialize data to a JSON string."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data)
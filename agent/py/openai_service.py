@@ -1,8 +1,22 @@
 """OpenAI service for agent."""
+import asyncio
+import hashlib
+import json
 import os
-from typing import List, Optional, Dict, Any
-from openai import OpenAI
-from openai.types.chat import ChatCompletion, ChatCompletionMessageParam
+import weakref
+from collections import OrderedDict
+from typing import AsyncIterator, List, Optional, Dict, Any, Union
+from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletion, ChatCompletionChunk, ChatCompletionMessageParam
+
+
+RESPONSE_CACHE_SIZE = 512
+
+# Shared services, one per event loop: the async client's connections are
+# bound to the loop that opened them
+_services: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, OpenAIService]' = (
+    weakref.WeakKeyDictionary()
+)
 
 
 class OpenAIService:
@@ -15,15 +29,46 @@ class OpenAIService:
             api_key: OpenAI API key. If not provided, uses OPENAI_API_KEY env var.
         """
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
-        self.client = OpenAI(api_key=self.api_key)
+        self.async_client = AsyncOpenAI(api_key=self.api_key)
+        self.cache_enabled = os.getenv('AGENT_RESPONSE_CACHE') == '1'
+        self._cache: OrderedDict[str, ChatCompletion] = OrderedDict()
+
+    async def aclose(self) -> None:
+        """Close the async client and stop sharing this instance."""
+        for loop, service in list(_services.items()):
+            if service is self:
+                del _services[loop]
+        await self.async_client.close()
+
+    def _cache_key(self, kwargs: Dict[str, Any]) -> str:
+        """Build an exact-match cache key for completion arguments."""
+        payload = json.dumps(kwargs, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+    async def create_embedding(self, text: str, model: str = 'text-embedding-3-small') -> List[float]:
+        """Create embedding for text.
+        
+        Args:
+            text: Text to embed.
+            model: Embedding model name.
+        
+        Returns:
+            Embedding vector.
+        """
+        try:
+            response = await self.async_client.embeddings.create(model=model, input=text)
+            return response.data[0].embedding
+        except Exception as error:
+            raise ValueError(f'Error creating embedding: {error}')
 
     async def completion(
         self,
         messages: List[ChatCompletionMessageParam],
         model: str = 'gpt-4o',
         json_mode: bool = False,
-        max_tokens: int = 4096
-    ) -> ChatCompletion:
+        max_tokens: int = 4096,
+        stream: bool = False
+    ) -> Union[ChatCompletion, AsyncIterator[ChatCompletionChunk]]:
         """Generate completion.
         
         Args:
@@ -31,9 +76,10 @@ class OpenAIService:
             model: Model name.
             json_mode: Whether to use JSON mode.
             max_tokens: Max tokens.
+            stream: Whether to stream response chunks.
         
         Returns:
-            ChatCompletion response.
+            ChatCompletion response or async chunk stream when streaming.
         """
         try:
             kwargs: Dict[str, Any] = {
@@ -45,7 +91,40 @@ class OpenAIService:
             if json_mode:
                 kwargs['response_format'] = {'type': 'json_object'}
             
-            return self.client.chat.completions.create(**kwargs)
+            if stream:
+                return await self.async_client.chat.completions.create(**kwargs, stream=True)
+            
+            if not self.cache_enabled:
+                return await self.async_client.chat.completions.create(**kwargs)
+            
+            key = self._cache_key(kwargs)
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+            
+            response = await self.async_client.chat.completions.create(**kwargs)
+            self._cache[key] = response
+            if len(self._cache) > RESPONSE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+            return response
         
         except Exception as error:
             raise ValueError(f'Error in OpenAI completion: {error}')
+
+
+def get_openai_service() -> OpenAIService:
+    """Get the OpenAI service shared by coroutines on the running event loop.
+
+    Each event loop gets its own instance, and a closed instance is replaced
+    on the next call. Outside a running loop a new, unshared instance is
+    returned.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return OpenAIService()
+    service = _services.get(loop)
+    if service is None:
+        service = _services[loop] = OpenAIService()
+    return service
@@ -0,0 +1,69 @@
+"""Semantic cache keyed by text embeddings."""
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+import numpy as np
+
+
+class SemanticCache:
+    """In-memory cache returning values stored for semantically similar text.
+
+    Holds at most maxsize entries; once full, each add replaces the oldest.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], Awaitable[List[float]]],
+        threshold: float,
+        maxsize: int = 1024,
+    ):
+        """Initialize semantic cache.
+
+        Args:
+            embed: Async function returning an embedding for text.
+            threshold: Minimum cosine similarity for a hit.
+            maxsize: Maximum number of cached entries.
+        """
+        self.embed = embed
+        self.threshold = threshold
+        self.maxsize = maxsize
+        # Rows are allocated once, on the first add, and reused as a ring buffer
+        self._matrix: Optional[np.ndarray] = None
+        self._values: List[Any] = [None] * maxsize
+        self._size = 0
+        self._next = 0
+
+    async def lookup(self, text: str) -> Tuple[np.ndarray, Optional[Any]]:
+        """Find the value stored for the most similar text.
+
+        Args:
+            text: Text to look up.
+
+        Returns:
+            Tuple of (normalized embedding of text, cached value or None).
+            The embedding can be passed to add() on a miss.
+        """
+        embedding = np.asarray(await self.embed(text), dtype=np.float32)
+        embedding /= np.linalg.norm(embedding) or 1.0
+
+        if not self._size:
+            return embedding, None
+
+        # Rows are unit vectors, so one matrix-vector product gives all cosine scores
+        scores = self._matrix[:self._size] @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold:
+            return embedding, self._values[best]
+        return embedding, None
+
+    def add(self, embedding: np.ndarray, value: Any) -> None:
+        """Store a value under a normalized embedding returned by lookup().
+
+        Args:
+            embedding: Normalized embedding.
+            value: Value to cache.
+        """
+        if self._matrix is None:
+            self._matrix = np.empty((self.maxsize, len(embedding)), dtype=np.float32)
+        self._matrix[self._next] = embedding
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.maxsize
+        self._size = min(self._size + 1, self.maxsize)
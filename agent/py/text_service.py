@@ -1,23 +1,32 @@
 """Text service for agent."""
+import asyncio
+import os
 import tiktoken
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 from uuid import uuid4
 from .types import IDoc
 
 
+@lru_cache(maxsize=8)
+def _get_tokenizer(model_name: str) -> Any:
+    """Get a shared tokenizer for model, falling back to cl100k_base."""
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        return tiktoken.get_encoding('cl100k_base')
+
+
 class TextService:
     """Text service for document creation."""
     
     def __init__(self, model_name: str = 'gpt-4o'):
         self.model_name = model_name
-        self.tokenizer: Optional[Any] = None
     
-    def _initialize_tokenizer(self) -> None:
-        if self.tokenizer is None:
-            try:
-                self.tokenizer = tiktoken.encoding_for_model(self.model_name)
-            except KeyError:
-                self.tokenizer = tiktoken.get_encoding('cl100k_base')
+    @property
+    def tokenizer(self) -> Any:
+        """Tokenizer for the current model, shared across instances."""
+        return _get_tokenizer(self.model_name)
     
     async def document(
         self,
@@ -28,7 +37,8 @@ class TextService:
         content_type: str,
         source: str,
         conversation_uuid: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        count_tokens: bool = False
     ) -> IDoc:
         """Create document.
         
@@ -41,17 +51,68 @@ class TextService:
             source: Source URL or identifier.
             conversation_uuid: Conversation UUID.
             metadata: Optional additional metadata.
+            count_tokens: Whether to fill in the document's token count.
         
         Returns:
             Document object.
         """
+        tokens = None
+        if count_tokens:
+            tokens = len(await asyncio.to_thread(self.tokenizer.encode_ordinary, text))
         return IDoc(
-            uuid=str(uuid4()),
+            uuid=uuid4().hex,
             name=name,
             description=description,
             type=doc_type,
             content_type=content_type,
             source=source,
             conversation_uuid=conversation_uuid,
-            text=text
+            text=text,
+            tokens=tokens
         )
+    
+    async def documents(
+        self, items: List[Dict[str, Any]], count_tokens: bool = False
+    ) -> List[IDoc]:
+        """Create many documents.
+        
+        Args:
+            items: Keyword arguments for document(), one dict per document.
+            count_tokens: Whether to fill in token counts, tokenizing all texts
+                in one batch in a worker thread.
+        
+        Returns:
+            Document objects in input order.
+        """
+        counts: List[Optional[int]] = [None] * len(items)
+        if count_tokens:
+            token_lists = await asyncio.to_thread(
+                self.tokenizer.encode_ordinary_batch,
+                [item['text'] for item in items],
+                num_threads=os.cpu_count() or 1
+            )
+            counts = [len(tokens) for tokens in token_lists]
+        return [
+            IDoc(
+                uuid=uuid4().hex,
+                name=item['name'],
+                description=item['description'],
+                type=item['doc_type'],
+                content_type=item['content_type'],
+                source=item['source'],
+                conversation_uuid=item['conversation_uuid'],
+                text=item['text'],
+                tokens=tokens
+            )
+            for item, tokens in zip(items, counts)
+        ]
+
+
+@lru_cache(maxsize=1)
+def get_text_service() -> TextService:
+    """Get the process-wide text service.
+
+    The service is stateless apart from the shared tokenizer, so it is safe
+    to use from any coroutine or thread.
+    """
+    return TextService()
@@ -4,7 +4,7 @@ from typing import List, Dict, Any, Optional
 from enum import Enum
 
 
-@dataclass
+@dataclass(slots=True)
 class AllowedDomain:
     """Allowed domain for web search."""
     name: str
@@ -12,7 +12,7 @@ class AllowedDomain:
     scrappable: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class IDoc:
     """Document with metadata."""
     uuid: str
@@ -23,9 +23,11 @@ class IDoc:
     source: str
     conversation_uuid: str
     text: str
+    # Token count of text, or None when it was not counted
+    tokens: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Search result from web search."""
     url: str
@@ -34,21 +36,21 @@ class SearchResult:
     content: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Query:
     """Query for web search."""
     q: str
     url: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ActionResult:
     """Result of an action."""
     text: str
     metadata: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     """Action taken by agent."""
     uuid: str
@@ -59,13 +61,13 @@ class Action:
     tool_uuid: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Agent configuration."""
     active_step: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class State:
     """Agent state."""
     messages: List[Dict[str, str]] = field(default_factory=list)
@@ -73,6 +75,6 @@ class State:
     actions: List[Action] = field(default_factory=list)
     config: Config = field(default_factory=Config)
     tools: List[Dict[str, str]] = field(default_factory=lambda: [
-        {'name': 'web_search', 'description': 'Search the web for information', 'parameters': 'query: str'},
+        {'name': 'web_search', 'description': 'Search the web for information', 'parameters': 'query: str, or queries: List[str] for independent searches'},
         {'name': 'final_answer', 'description': 'Provide final answer', 'parameters': 'answer: str'}
     ])
@@ -1,18 +1,69 @@
 """Web search service using Firecrawl."""
-import aiohttp
-from typing import List, Dict, Any, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import weakref
+from functools import lru_cache
+from urllib.parse import urlparse
+import httpx
+from typing import List, Dict, Any, Optional, Tuple
 from .types import AllowedDomain, SearchResult, Query, IDoc
-from .openai_service import OpenAIService
-from .text_service import TextService
+from .openai_service import OpenAIService, get_openai_service
+from .text_service import get_text_service
+from .json_utils import json_loads
+from .semantic_cache import SemanticCache
 from openai.types.chat import ChatCompletionMessageParam
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on in-flight Firecrawl requests per service
+FIRECRAWL_CONCURRENCY = 8
+
+# Results requested per domain, and the longest combined multi-site query sent in one request
+RESULTS_PER_DOMAIN = 6
+MAX_SEARCH_QUERY_LENGTH = 400
+
+# Lifetime and size of the exact-match cache for search decisions and queries
+LLM_CACHE_TTL = 3600
+LLM_CACHE_SIZE = 1024
+
+# Matches the search decision as soon as it appears in a streamed JSON response
+SHOULD_SEARCH_RE = re.compile(r'"should_search"\s*:\s*(true|false)')
+
+# Minimum cosine similarity for a question to reuse previously generated queries
+QUERY_CACHE_THRESHOLD = 0.92
+# Maximum number of questions kept in the semantic query cache
+QUERY_CACHE_SIZE = 512
+
+# Shared services, one per event loop: the HTTP client and semaphore are
+# bound to the loop that first uses them
+_services: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, WebSearchService]' = (
+    weakref.WeakKeyDictionary()
+)
+
+
+@lru_cache(maxsize=4096)
+def _hostname(url: str) -> str:
+    """Extract the hostname from a URL or bare domain."""
+    return urlparse(url if '//' in url else f'//{url}').hostname or ''
+
+
+def _site_domain(url: str) -> str:
+    """Reduce a domain URL to its registrable domain for site: filters."""
+    url_parts = url.split('.')
+    return '.'.join(url_parts[-2:]) if len(url_parts) > 1 else url
+
 
 class WebSearchService:
     """Web search service with Firecrawl integration."""
     
-    def __init__(self):
-        self.openai_service = OpenAIService()
-        self.text_service = TextService()
+    def __init__(self, openai_service: Optional[OpenAIService] = None):
+        self.openai_service = openai_service or get_openai_service()
+        self.text_service = get_text_service()
         self.allowed_domains = [
             AllowedDomain('Wikipedia', 'wikipedia.org', True),
             AllowedDomain('FS.blog', 'fs.blog', True),
@@ -25,7 +76,65 @@ class WebSearchService:
             AllowedDomain('Anthropic', 'anthropic.com', True),
             AllowedDomain('DeepMind', 'deepmind.google', True),
         ]
+        self._allowed = frozenset(d.url for d in self.allowed_domains)
+        self._scrappable = frozenset(d.url for d in self.allowed_domains if d.scrappable)
+        self._site_domains = {d.url: _site_domain(d.url) for d in self.allowed_domains}
+        self._scrappable_sites = frozenset(self._site_domains[url] for url in self._scrappable)
+        self._domains_prompt = ', '.join(f'{d.name} ({d.url})' for d in self.allowed_domains)
         self.api_key = os.getenv('FIRECRAWL_API_KEY', '')
+        # HTTP/2 lets concurrent Firecrawl calls share one connection
+        self._client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            timeout=30
+        )
+        self._semaphore = asyncio.Semaphore(FIRECRAWL_CONCURRENCY)
+        self._llm_cache: Dict[str, Tuple[float, Any]] = {}
+        self._query_cache = SemanticCache(
+            self.openai_service.create_embedding, QUERY_CACHE_THRESHOLD, QUERY_CACHE_SIZE
+        )
+    
+    def _in_domains(self, url: str, domains: frozenset) -> bool:
+        """Check whether a URL's host or one of its parent domains is in domains."""
+        labels = _hostname(url).split('.')
+        return any('.'.join(labels[i:]) in domains for i in range(len(labels)))
+    
+    def _cache_key(self, kind: str, messages: List[ChatCompletionMessageParam]) -> str:
+        """Hash normalized messages into a cache key."""
+        normalized = [
+            {
+                'role': message['role'],
+                'content': message['content'].strip().lower()
+                if message['role'] == 'user' and isinstance(message['content'], str)
+                else message['content']
+            }
+            for message in messages
+        ]
+        payload = json.dumps([kind, normalized], sort_keys=True, default=str).encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[Any]:
+        """Return a cached value unless it is missing or expired."""
+        entry = self._llm_cache.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+    
+    def _cache_set(self, key: str, value: Any) -> None:
+        """Store a value, dropping expired and then oldest entries when full."""
+        now = time.monotonic()
+        if len(self._llm_cache) >= LLM_CACHE_SIZE:
+            self._llm_cache = {k: v for k, v in self._llm_cache.items() if v[0] >= now}
+            while len(self._llm_cache) >= LLM_CACHE_SIZE:
+                del self._llm_cache[next(iter(self._llm_cache))]
+        self._llm_cache[key] = (now + LLM_CACHE_TTL, value)
+    
+    async def aclose(self) -> None:
+        """Close the HTTP client and stop sharing this instance."""
+        for loop, service in list(_services.items()):
+            if service is self:
+                del _services[loop]
+        await self._client.aclose()
     
     async def is_web_search_needed(self, messages: List[ChatCompletionMessageParam]) -> bool:
         """Determine if web search is needed.
@@ -36,22 +145,45 @@ class WebSearchService:
         Returns:
             Whether web search is needed.
         """
+        key = self._cache_key('should_search', messages)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
         system_prompt: ChatCompletionMessageParam = {
             'role': 'system',
             'content': 'Determine if web search is needed to answer the query. Respond with JSON: {"should_search": bool}'
         }
         
-        response = await self.openai_service.completion(
+        # Stream the answer and stop reading once the decision is known
+        stream = await self.openai_service.completion(
             messages=[system_prompt] + messages,
-            json_mode=True
+            json_mode=True,
+            stream=True
         )
         
+        content = ''
+        match = None
         try:
-            import json
-            result = json.loads(response.choices[0].message.content or '{}')
-            return result.get('should_search', False)
-        except:
-            return False
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    content += chunk.choices[0].delta.content
+                    match = SHOULD_SEARCH_RE.search(content)
+                    if match:
+                        break
+        finally:
+            await stream.close()
+        
+        if match:
+            should_search = match.group(1) == 'true'
+        else:
+            try:
+                should_search = json_loads(content or '{}').get('should_search', False)
+            except:
+                return False
+        
+        self._cache_set(key, should_search)
+        return should_search
     
     async def generate_queries(self, messages: List[ChatCompletionMessageParam]) -> Dict[str, Any]:
         """Generate search queries.
@@ -62,7 +194,23 @@ class WebSearchService:
         Returns:
             Dict with queries and thoughts.
         """
-        domain_list = ', '.join([f'{d.name} ({d.url})' for d in self.allowed_domains])
+        key = self._cache_key('queries', messages)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        
+        # Paraphrased questions reuse queries generated for an earlier one. Only
+        # opening questions are matched: a follow-up depends on earlier turns.
+        embedding = None
+        if sum(1 for m in messages if m['role'] == 'user') == 1:
+            try:
+                embedding, cached = await self._query_cache.lookup(str(messages[-1]['content']))
+            except Exception:
+                logger.warning('Query cache lookup failed; generating queries', exc_info=True)
+            else:
+                if cached is not None:
+                    return cached
+        
         system_prompt: ChatCompletionMessageParam = {
             'role': 'system',
             'content': f'''Generate search queries for the given question. Return JSON:
@@ -71,7 +219,7 @@ class WebSearchService:
   "_thoughts": "explanation"
 }}
 
-Allowed domains: {domain_list}'''
+Allowed domains: {self._domains_prompt}'''
         }
         
         response = await self.openai_service.completion(
@@ -80,10 +228,17 @@ Allowed domains: {domain_list}'''
         )
         
         try:
-            import json
-            return json.loads(response.choices[0].message.content or '{}')
+            result = json_loads(response.choices[0].message.content or '{}')
         except:
             return {'queries': [], '_thoughts': ''}
+        
+        self._cache_set(key, result)
+        if embedding is not None:
+            try:
+                self._query_cache.add(embedding, result)
+            except Exception:
+                logger.warning('Query cache update failed', exc_info=True)
+        return result
     
     async def search_web(self, queries: List[Query], conversation_uuid: str) -> List[Dict[str, Any]]:
         """Search the web using Firecrawl.
@@ -95,45 +250,111 @@ Allowed domains: {domain_list}'''
         Returns:
             Search results.
         """
-        search_results = []
+        if not queries:
+            return []
+        
+        # Queries sharing the same text are combined into one multi-site request
+        groups: Dict[str, List[str]] = {}
+        for query in queries:
+            domains = groups.setdefault(query.q, [])
+            domain = self._site_domains.get(query.url) or _site_domain(query.url)
+            if domain not in domains:
+                domains.append(domain)
         
-        async with aiohttp.ClientSession() as session:
-            for query in queries:
-                try:
-                    url_parts = query.url.split('.')
-                    domain = '.'.join(url_parts[-2:]) if len(url_parts) > 1 else query.url
-                    site_query = f'site:{domain} {query.q}'
-                    
-                    async with session.post(
-                        'https://api.firecrawl.dev/v0/search',
-                        json={
-                            'query': site_query,
-                            'searchOptions': {'limit': 6},
-                            'pageOptions': {'fetchPageContent': False}
-                        },
-                        headers={
-                            'Authorization': f'Bearer {self.api_key}',
-                            'Content-Type': 'application/json'
-                        }
-                    ) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            if data.get('success') and data.get('data'):
-                                results = [{
-                                    'url': item['url'],
-                                    'title': item.get('title', ''),
-                                    'description': item.get('description', '')
-                                } for item in data['data']]
-                                search_results.append({
-                                    'query': query.q,
-                                    'domain': domain,
-                                    'results': results
-                                })
-                except Exception as e:
-                    print(f'Error searching {query.q}: {e}')
+        batches: List[Tuple[str, List[str]]] = []
+        for q, domains in groups.items():
+            if len(domains) > 1 and len(self._site_query(q, domains)) > MAX_SEARCH_QUERY_LENGTH:
+                batches.extend((q, [domain]) for domain in domains)
+            else:
+                batches.append((q, domains))
+        
+        results = await asyncio.gather(
+            *[self._search_batch(q, domains) for q, domains in batches],
+            return_exceptions=True
+        )
+        
+        search_results = []
+        for (q, _), result in zip(batches, results):
+            if isinstance(result, Exception):
+                logger.error('Error searching %s', q, exc_info=result)
+            else:
+                search_results.extend(result)
         
         return search_results
     
+    def _site_query(self, q: str, domains: List[str]) -> str:
+        """Build a Firecrawl query restricted to the given domains."""
+        return ' OR '.join(f'site:{domain}' for domain in domains) + f' {q}'
+    
+    async def _search_batch(
+        self,
+        q: str,
+        domains: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Run one Firecrawl search for a query across one or more domains.
+        
+        Args:
+            q: Query text.
+            domains: Domains to restrict the search to.
+        
+        Returns:
+            One search result group per domain that returned results.
+            Results carry page markdown under 'content' when every domain
+            in the batch is scrappable.
+        """
+        # Scrappable domains get page content inline instead of a second scrape round
+        fetch_content = all(domain in self._scrappable_sites for domain in domains)
+        page_options = (
+            {'fetchPageContent': True, 'onlyMainContent': True}
+            if fetch_content else {'fetchPageContent': False}
+        )
+        async with self._semaphore:
+            resp = await self._client.post(
+                'https://api.firecrawl.dev/v0/search',
+                json={
+                    'query': self._site_query(q, domains),
+                    'searchOptions': {'limit': RESULTS_PER_DOMAIN * len(domains)},
+                    'pageOptions': page_options
+                },
+                headers={
+                    'Authorization': f'Bearer {self.api_key}',
+                    'Content-Type': 'application/json'
+                }
+            )
+        if resp.status_code != 200:
+            return []
+        data = json_loads(resp.content)
+        
+        if not (data.get('success') and data.get('data')):
+            return []
+        
+        # Route each result back to the domain it was found on
+        buckets: Dict[str, List[Dict[str, str]]] = {domain: [] for domain in domains}
+        for item in data['data']:
+            if len(domains) == 1:
+                domain = domains[0]
+            else:
+                hostname = _hostname(item['url'])
+                domain = next(
+                    (d for d in domains if hostname == d or hostname.endswith(f'.{d}')),
+                    None
+                )
+                if domain is None:
+                    continue
+            if len(buckets[domain]) < RESULTS_PER_DOMAIN:
+                buckets[domain].append({
+                    'url': item['url'],
+                    'title': item.get('title', ''),
+                    'description': item.get('description', ''),
+                    'content': item.get('markdown') if fetch_content else None
+                })
+        
+        return [
+            {'query': q, 'domain': domain, 'results': results}
+            for domain, results in buckets.items()
+            if results
+        ]
+    
     async def scrape_urls(self, urls: List[str], conversation_uuid: str) -> List[Dict[str, str]]:
         """Scrape URLs for content.
         
@@ -146,33 +367,51 @@ Allowed domains: {domain_list}'''
         """
         scrappable_urls = [
             url for url in urls
-            if any(domain.url in url for domain in self.allowed_domains if domain.scrappable)
+            if self._in_domains(url, self._scrappable)
         ]
+        if not scrappable_urls:
+            return []
+        
+        results = await asyncio.gather(
+            *[self._scrape_url(url) for url in scrappable_urls],
+            return_exceptions=True
+        )
         
         scrapedContent = []
-        async with aiohttp.ClientSession() as session:
-            for url in scrappable_urls:
-                try:
-                    async with session.post(
-                        'https://api.firecrawl.dev/v0/scrape',
-                        json={
-                            'url': url,
-                            'formats': ['markdown']
-                        },
-                        headers={'Authorization': f'Bearer {self.api_key}'}
-                    ) as resp:
-                        if resp.status == 200:
-                            data = await resp.json()
-                            if data.get('success') and data['data'].get('markdown'):
-                                scrapedContent.append({
-                                    'url': url,
-                                    'content': data['data']['markdown']
-                                })
-                except Exception as e:
-                    print(f'Error scraping {url}: {e}')
+        for url, result in zip(scrappable_urls, results):
+            if isinstance(result, Exception):
+                logger.error('Error scraping %s', url, exc_info=result)
+            elif result is not None:
+                scrapedContent.append(result)
         
         return scrapedContent
     
+    async def _scrape_url(self, url: str) -> Optional[Dict[str, str]]:
+        """Scrape a single URL as markdown.
+        
+        Args:
+            url: URL to scrape.
+        
+        Returns:
+            Scraped content or None when nothing was returned.
+        """
+        async with self._semaphore:
+            resp = await self._client.post(
+                'https://api.firecrawl.dev/v0/scrape',
+                json={
+                    'url': url,
+                    'formats': ['markdown']
+                },
+                headers={'Authorization': f'Bearer {self.api_key}'}
+            )
+        if resp.status_code != 200:
+            return None
+        data = json_loads(resp.content)
+        
+        if data.get('success') and data['data'].get('markdown'):
+            return {'url': url, 'content': data['data']['markdown']}
+        return None
+    
     async def search(self, query: str, conversation_uuid: str) -> List[IDoc]:
         """Execute complete web search.
         
@@ -194,7 +433,7 @@ Allowed domains: {domain_list}'''
         queries = [
             Query(q=q['q'], url=q['url'])
             for q in query_result.get('queries', [])
-            if any(d.url in q.get('url', '') for d in self.allowed_domains)
+            if self._in_domains(q.get('url', ''), self._allowed)
         ]
         
         if not queries:
@@ -203,30 +442,56 @@ Allowed domains: {domain_list}'''
         # Search web
         search_results = await self.search_web(queries, conversation_uuid)
         
-        # Extract URLs to scrape
-        urls_to_scrape = []
-        for sr in search_results:
-            urls_to_scrape.extend([r['url'] for r in sr['results']])
-        
-        # Scrape URLs
+        # Scrape only URLs the search did not already return content for
+        urls_to_scrape = [
+            r['url']
+            for sr in search_results
+            for r in sr['results']
+            if not r.get('content')
+        ]
         scraped_content = await self.scrape_urls(urls_to_scrape, conversation_uuid)
         
         # Create documents
-        docs: List[IDoc] = []
+        scraped_by_url = {s['url'].rstrip('/'): s for s in scraped_content}
+        
+        items: List[Dict[str, Any]] = []
         for sr in search_results:
             for result in sr['results']:
-                scraped = next((s for s in scraped_content if s['url'] == result['url']), None)
-                content = scraped['content'] if scraped else result['description']
-                
-                doc = await self.text_service.document(
-                    text=content,
-                    name=result['title'],
-                    description=f'Web search result for: "{sr["query"]}"',
-                    doc_type='web_page',
-                    content_type='complete' if scraped else 'chunk',
-                    source=result['url'],
-                    conversation_uuid=conversation_uuid
+                scraped = (
+                    result.get('content')
+                    or scraped_by_url.get(result['url'].rstrip('/'), {}).get('content')
                 )
-                docs.append(doc)
+                content = scraped or result['description']
+                if not content:
+                    continue
+                
+                items.append({
+                    'text': content,
+                    'name': result['title'],
+                    'description': f'Web search result for: "{sr["query"]}"',
+                    'doc_type': 'web_page',
+                    'content_type': 'complete' if scraped else 'chunk',
+                    'source': result['url'],
+                    'conversation_uuid': conversation_uuid
+                })
+        
+        docs = await self.text_service.documents(items)
         
         return docs
+
+
+def get_web_search_service() -> WebSearchService:
+    """Get the web search service shared by coroutines on the running event loop.
+
+    The instance owns the HTTP client and the decision and query caches. Each
+    event loop gets its own instance, and a closed instance is replaced on the
+    next call. Outside a running loop a new, unshared instance is returned.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return WebSearchService()
+    service = _services.get(loop)
+    if service is None:
+        service = _services[loop] = WebSearchService()
+    return service
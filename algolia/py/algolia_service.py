@@ -1,30 +1,182 @@
 """Algolia search service implementation.
 
 Wrappers around Algolia API client providing type-safe, async-ready search operations.
+The client is synchronous, so every call runs in a worker thread to keep the
+event loop free and let concurrent requests overlap.
 """
 
+import asyncio
+import copy
+import functools
+from collections import defaultdict
+import json
 import os
-from typing import Any, Optional, Dict, List, Sequence
-from dataclasses import dataclass
+import re
+import uuid
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Callable, Optional, Dict, List, Sequence, Set, Tuple, TypeVar
+from dataclasses import dataclass, replace
 import logging
 
+import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
 logger = logging.getLogger(__name__)
 
+F = TypeVar("F", bound=Callable[..., Any])
+
 try:
     from algoliasearch.search_client import SearchClient
+    from algoliasearch.exceptions import (
+        AlgoliaException,
+        AlgoliaUnreachableHostException,
+        RequestException,
+    )
 except ImportError:
     logger.warning("algoliasearch package not installed. Install with: pip install algoliasearch")
     SearchClient = None
+    AlgoliaException = AlgoliaUnreachableHostException = RequestException = Exception
 
-
-@dataclass
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Objects sent per batch request, as recommended by Algolia
+SAVE_BATCH_SIZE = 1000
+
+# Upper bound on concurrent write requests, to stay under Algolia rate limits
+WRITE_CONCURRENCY = 16
+
+# Attempts and first backoff delay in seconds for retried write requests
+WRITE_RETRIES = 3
+WRITE_RETRY_BASE_DELAY = 0.1
+
+# Connections kept per Algolia host; the client default of 10 throttles concurrent calls
+HTTP_POOL_SIZE = 50
+
+# Lifetime in seconds and size of cached search results and index listings
+SEARCH_CACHE_TTL = 60
+SEARCH_CACHE_SIZE = 1024
+INDICES_CACHE_TTL = 30
+
+# Parameters that only affect analytics, not the hits returned
+_ANALYTICS_PARAMS = frozenset({"analytics", "clickAnalytics"})
+
+# Search parameters shared by every query; per-call options override them.
+# Ranking info, facets and highlights are opt-in through SearchOptions.
+_DEFAULT_SEARCH_PARAMS = MappingProxyType({
+    "hitsPerPage": 20,
+    "page": 0,
+    "typoTolerance": True,
+    "ignorePlurals": True,
+    "removeStopWords": True,
+    "queryType": "prefixNone",
+    "highlightPreTag": "<em>",
+    "highlightPostTag": "</em>",
+    "analytics": True,
+    "clickAnalytics": True,
+    "enablePersonalization": False,
+    "distinct": 1,
+    "minWordSizefor1Typo": 1,
+    "minWordSizefor2Typos": 3,
+    "advancedSyntax": True,
+    "removeWordsIfNoResults": "lastWords",
+})
+
+
+@functools.lru_cache(maxsize=8)
+def _base_search_params(
+    include_ranking: bool, include_facets: bool, include_highlights: bool
+) -> MappingProxyType:
+    """Build the default search parameters for one combination of opt-in flags.
+
+    Args:
+        include_ranking: Request ranking info per hit
+        include_facets: Request all facets
+        include_highlights: Highlight every attribute; otherwise highlight none
+
+    Returns:
+        Read-only search parameters, built once per combination
+    """
+    params = dict(_DEFAULT_SEARCH_PARAMS)
+    if include_ranking:
+        params["getRankingInfo"] = True
+    if include_facets:
+        params["facets"] = ["*"]
+    # Algolia highlights every searchable attribute unless told otherwise
+    params["attributesToHighlight"] = ["*"] if include_highlights else []
+    return MappingProxyType(params)
+
+
+def _install_orjson_serializer() -> None:
+    """Encode Algolia request bodies with orjson, falling back to the client's encoder.
+
+    Datetimes, dataclasses and other types orjson does not encode natively
+    go through the client's JSONEncoder.default, so datetimes are still sent
+    as epoch seconds. Bodies orjson rejects (non-string keys, integers beyond
+    64 bits) are encoded by the client's serializer.
+
+    Does nothing when orjson is missing or the client has no DataSerializer.
+    """
+    try:
+        from algoliasearch.http.serializer import DataSerializer, JSONEncoder
+    except ImportError:
+        return
+    if orjson is None or getattr(DataSerializer.serialize, "_orjson", False):
+        return
+
+    client_serialize = DataSerializer.serialize
+    default = JSONEncoder().default
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def serialize(data: Any) -> str:
+        try:
+            return orjson.dumps(data, default=default, option=options).decode()
+        except TypeError:
+            return client_serialize(data)
+
+    serialize._orjson = True  # type: ignore[attr-defined]
+    DataSerializer.serialize = staticmethod(serialize)
+
+
+def _algolia_call(operation: str) -> Callable[[F], F]:
+    """Log and re-raise errors from an AlgoliaService coroutine method.
+
+    Algolia API errors are logged briefly; anything else is logged with its
+    traceback.
+
+    Args:
+        operation: Operation name used in the error log
+    """
+    def decorator(method: F) -> F:
+        @functools.wraps(method)
+        async def wrapper(self: "AlgoliaService", *args: Any, **kwargs: Any) -> Any:
+            try:
+                return await method(self, *args, **kwargs)
+            except AlgoliaException as e:
+                logger.error("Error in %s: %s", operation, e)
+                raise
+            except Exception:
+                logger.exception("Unexpected error in %s", operation)
+                raise
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+@dataclass(slots=True, frozen=True)
 class SearchOptions:
     """Options for search queries."""
     headers: Optional[Dict[str, str]] = None
     query_parameters: Optional[Dict[str, Any]] = None
+    include_ranking: bool = False
+    include_facets: bool = False
+    include_highlights: bool = False
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SearchResult:
     """Represents a search result."""
     hits: List[Dict[str, Any]]
@@ -40,12 +192,13 @@ class SearchResult:
 class AlgoliaService:
     """Algolia search service for managing search indices and queries."""
 
-    def __init__(self, app_id: str, api_key: str) -> None:
+    def __init__(self, app_id: str, api_key: str, pool_size: int = HTTP_POOL_SIZE) -> None:
         """Initialize Algolia service.
 
         Args:
             app_id: Algolia application ID
             api_key: Algolia API key
+            pool_size: Maximum pooled HTTP connections per Algolia host
         """
         if not SearchClient:
             raise ImportError(
@@ -54,9 +207,143 @@ class AlgoliaService:
         
         self.app_id = app_id
         self.api_key = api_key
+        _install_orjson_serializer()
         self.client = SearchClient.create(app_id, api_key)
-        logger.info(f"Initialized Algolia service for app: {app_id}")
+        self._configure_pool(pool_size)
+        self._indices: Dict[str, Any] = {}
+        self._search_cache: TTLCache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+        self._indices_cache: TTLCache = TTLCache(maxsize=1, ttl=INDICES_CACHE_TTL)
+        self._keys_by_index: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
+        logger.info("Initialized Algolia service for app: %s", app_id)
+
+    def _configure_pool(self, pool_size: int) -> None:
+        """Give the client's requester a session with a larger connection pool.
+
+        The requester only builds its session on the first request, so it is
+        created here instead. The adapter keeps urllib3 retries off, as the
+        client's own session does, so the client's host failover still applies.
+
+        Args:
+            pool_size: Maximum pooled connections per host
+        """
+        requester = getattr(getattr(self.client, "_transporter", None), "_requester", None)
+        if requester is None or getattr(requester, "_session", None) is not None:
+            logger.debug("Algolia client exposes no unused HTTP session; keeping default pool")
+            return
+        session = requests.Session()
+        session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+                max_retries=Retry(connect=0),
+            ),
+        )
+        requester._session = session
+
+    def _index(self, index_name: str) -> Any:
+        """Get a cached index handle, creating it on first use.
+
+        Args:
+            index_name: Name of the index
+
+        Returns:
+            Index handle from the client
+        """
+        index = self._indices.get(index_name)
+        if index is None:
+            index = self._indices[index_name] = self.client.init_index(index_name)
+        return index
+
+    async def __aenter__(self) -> "AlgoliaService":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def _retry(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking client call, retrying transient failures with backoff.
+
+        Unreachable hosts, rate limiting (429) and server errors (5xx) are
+        retried; other errors are raised at once.
+
+        Args:
+            fn: Client method to call in a worker thread
+            *args: Arguments for fn
+
+        Returns:
+            Result of fn
+        """
+        for attempt in range(WRITE_RETRIES):
+            try:
+                return await asyncio.to_thread(fn, *args)
+            except (AlgoliaUnreachableHostException, RequestException) as e:
+                status = getattr(e, "status_code", None)
+                retryable = (
+                    isinstance(e, AlgoliaUnreachableHostException)
+                    or status == 429
+                    or (status is not None and status >= 500)
+                )
+                if not retryable or attempt == WRITE_RETRIES - 1:
+                    raise
+                delay = WRITE_RETRY_BASE_DELAY * 2 ** attempt
+                logger.warning("Retrying %s in %ss: %s", fn.__name__, delay, e)
+                await asyncio.sleep(delay)
+
+    async def warmup(self) -> None:
+        """Open pooled connections ahead of the first user request.
+
+        Fetches the index list, which also primes its cache. Failures are
+        logged and ignored so a cold start never fails on warmup alone.
+        """
+        try:
+            await self.list_indices()
+        except Exception as e:
+            logger.warning("Algolia warmup failed: %s", e)
+
+    async def close(self) -> None:
+        """Close the underlying client and its connections."""
+        await asyncio.to_thread(self.client.close)
 
+    def invalidate(self, index_name: str) -> None:
+        """Drop cached search results for an index and the cached index list.
+
+        Args:
+            index_name: Name of the index that changed
+        """
+        for key in self._keys_by_index.pop(index_name, ()):
+            self._search_cache.pop(key, None)
+        self._indices_cache.clear()
+
+    def _canonical_key(
+        self, index_name: str, query: str, params: Dict[str, Any]
+    ) -> Tuple[str, str]:
+        """Build a search cache key that ignores differences not affecting hits.
+
+        The query is lowercased with whitespace collapsed, flat AND-only or
+        OR-only filters are sorted, and analytics-only parameters are dropped.
+        Punctuation is kept because advancedSyntax gives quotes and dashes meaning.
+
+        Args:
+            index_name: Name of the index
+            query: Search query string
+            params: Merged search parameters
+
+        Returns:
+            Cache key tuple of (index name, canonical parameters JSON)
+        """
+        key_params = {k: v for k, v in params.items() if k not in _ANALYTICS_PARAMS}
+        key_params["query"] = re.sub(r"\s+", " ", query.strip().lower())
+        filters = key_params.get("filters")
+        if isinstance(filters, str) and "(" not in filters:
+            has_and, has_or = " AND " in filters, " OR " in filters
+            if has_and != has_or:
+                operator = " AND " if has_and else " OR "
+                clauses = sorted(clause.strip() for clause in filters.split(operator))
+                key_params["filters"] = operator.join(clauses)
+        return index_name, json.dumps(key_params, sort_keys=True, default=str)
+
+    @_algolia_call("search_single_index")
     async def search_single_index(
         self,
         index_name: str,
@@ -65,6 +352,10 @@ class AlgoliaService:
     ) -> SearchResult:
         """Search in a single index.
 
+        Callers should list the fields they read in attributesToRetrieve,
+        which keeps responses small. Highlighting is off unless
+        include_highlights is set.
+
         Args:
             index_name: Name of the index to search
             query: Search query string
@@ -76,55 +367,79 @@ class AlgoliaService:
         if options is None:
             options = SearchOptions()
 
-        default_params = {
-            "hitsPerPage": 20,
-            "page": 0,
-            "attributesToRetrieve": ["*"],
-            "typoTolerance": True,
-            "ignorePlurals": True,
-            "removeStopWords": True,
-            "queryType": "prefixNone",
-            "attributesToHighlight": ["*"],
-            "highlightPreTag": "<em>",
-            "highlightPostTag": "</em>",
-            "analytics": True,
-            "clickAnalytics": True,
-            "enablePersonalization": False,
-            "distinct": 1,
-            "facets": ["*"],
-            "minWordSizefor1Typo": 1,
-            "minWordSizefor2Typos": 3,
-            "advancedSyntax": True,
-            "removeWordsIfNoResults": "lastWords",
-            "getRankingInfo": True,
-        }
-
-        merged_params = {
-            **default_params,
-            "query": query,
-            **(options.query_parameters or {}),
-        }
+        base_params = _base_search_params(
+            options.include_ranking, options.include_facets, options.include_highlights
+        )
+        merged_params = {**base_params, "query": query, **(options.query_parameters or {})}
 
-        try:
-            index = self.client.init_index(index_name)
-            result = index.search(query, merged_params)
-            
-            logger.debug(f"Search completed: {result.get('nbHits', 0)} hits")
-            
-            return SearchResult(
-                hits=result.get("hits", []),
-                nbHits=result.get("nbHits", 0),
-                nbPages=result.get("nbPages", 0),
-                page=result.get("page", 0),
-                hitsPerPage=result.get("hitsPerPage", 0),
-                processingTimeMS=result.get("processingTimeMS", 0),
-                query=result.get("query", ""),
-                ranking_info=result.get("_rankingInfo"),
-            )
-        except Exception as e:
-            logger.error(f"Search error in {index_name}: {e}")
-            raise
+        cache_key = self._canonical_key(index_name, query, merged_params)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            # Callers own their result, so a mutated hit never reaches the cache
+            return copy.deepcopy(cached)
 
+        index = self._index(index_name)
+        result = await asyncio.to_thread(index.search, query, merged_params)
+        
+        logger.debug("Search completed: %s hits", result.get('nbHits', 0))
+        
+        search_result = SearchResult(
+            hits=result.get("hits", []),
+            nbHits=result.get("nbHits", 0),
+            nbPages=result.get("nbPages", 0),
+            page=result.get("page", 0),
+            hitsPerPage=result.get("hitsPerPage", 0),
+            processingTimeMS=result.get("processingTimeMS", 0),
+            query=result.get("query", ""),
+            ranking_info=result.get("_rankingInfo"),
+        )
+        self._search_cache[cache_key] = copy.deepcopy(search_result)
+        keys = self._keys_by_index[index_name]
+        keys.add(cache_key)
+        if len(keys) > SEARCH_CACHE_SIZE:
+            # Forget keys the TTL cache has already expired or evicted
+            keys.intersection_update(self._search_cache.keys())
+        return search_result
+
+    async def search_iter(
+        self,
+        index_name: str,
+        query: str,
+        options: Optional[SearchOptions] = None,
+        max_hits: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield hits one at a time, fetching further pages as needed.
+
+        Args:
+            index_name: Name of the index to search
+            query: Search query string
+            options: Optional search options; query_parameters["page"] sets the first page
+            max_hits: Optional maximum number of hits to yield
+
+        Yields:
+            Hits in ranking order
+        """
+        if options is None:
+            options = SearchOptions()
+        query_parameters = dict(options.query_parameters or {})
+        page = query_parameters.get("page", 0)
+        count = 0
+
+        while max_hits is None or count < max_hits:
+            query_parameters["page"] = page
+            result = await self.search_single_index(
+                index_name, query, replace(options, query_parameters=dict(query_parameters))
+            )
+            for hit in result.hits:
+                yield hit
+                count += 1
+                if max_hits is not None and count >= max_hits:
+                    return
+            page += 1
+            if not result.hits or page >= result.nbPages:
+                return
+
+    @_algolia_call("save_object")
     async def save_object(
         self, index_name: str, obj: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -137,15 +452,51 @@ class AlgoliaService:
         Returns:
             Response from Algolia
         """
-        try:
-            index = self.client.init_index(index_name)
-            response = index.save_object(obj)
-            logger.debug(f"Object saved to {index_name}")
-            return response
-        except Exception as e:
-            logger.error(f"Error saving object to {index_name}: {e}")
-            raise
+        index = self._index(index_name)
+        response = await self._retry(index.save_object, obj)
+        self.invalidate(index_name)
+        logger.debug("Object saved to %s", index_name)
+        return response
+
+    @_algolia_call("save_objects")
+    async def save_objects(
+        self,
+        index_name: str,
+        objs: List[Dict[str, Any]],
+        max_concurrency: int = WRITE_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """Save objects to the index in batch requests.
 
+        Args:
+            index_name: Name of the index
+            objs: Objects to save; objects without 'objectID' get one generated
+            max_concurrency: Maximum batch requests in flight
+
+        Returns:
+            One response from Algolia per batch
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        index = self._index(index_name)
+        # IDs are assigned here rather than by Algolia so that retrying a batch
+        # whose first attempt landed overwrites records instead of duplicating them
+        objs = [
+            obj if "objectID" in obj else {**obj, "objectID": str(uuid.uuid4())}
+            for obj in objs
+        ]
+
+        async def save_batch(batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._retry(index.save_objects, batch)
+
+        responses = await asyncio.gather(*[
+            save_batch(objs[start:start + SAVE_BATCH_SIZE])
+            for start in range(0, len(objs), SAVE_BATCH_SIZE)
+        ])
+        self.invalidate(index_name)
+        logger.debug("Saved %s objects to %s", len(objs), index_name)
+        return responses
+
+    @_algolia_call("get_object")
     async def get_object(
         self,
         index_name: str,
@@ -162,15 +513,12 @@ class AlgoliaService:
         Returns:
             The object
         """
-        try:
-            index = self.client.init_index(index_name)
-            response = index.get_object(object_id)
-            logger.debug(f"Object retrieved from {index_name}")
-            return response
-        except Exception as e:
-            logger.error(f"Error getting object from {index_name}: {e}")
-            raise
+        index = self._index(index_name)
+        response = await asyncio.to_thread(index.get_object, object_id)
+        logger.debug("Object retrieved from %s", index_name)
+        return response
 
+    @_algolia_call("add_or_update_object")
     async def add_or_update_object(
         self, index_name: str, object_id: str, obj: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -184,16 +532,43 @@ class AlgoliaService:
         Returns:
             Response from Algolia
         """
-        try:
-            index = self.client.init_index(index_name)
-            obj_with_id = {**obj, "objectID": object_id}
-            response = index.save_object(obj_with_id)
-            logger.debug(f"Object added/updated in {index_name}")
-            return response
-        except Exception as e:
-            logger.error(f"Error updating object in {index_name}: {e}")
-            raise
+        index = self._index(index_name)
+        obj_with_id = {**obj, "objectID": object_id}
+        response = await self._retry(index.save_object, obj_with_id)
+        self.invalidate(index_name)
+        logger.debug("Object added/updated in %s", index_name)
+        return response
+
+    async def add_or_update_objects(
+        self,
+        index_name: str,
+        objects: Dict[str, Dict[str, Any]],
+        max_concurrency: int = WRITE_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """Add or update objects with one request each, run concurrently.
+
+        Prefer save_objects() for bulk indexing; this keeps per-object
+        requests for callers that need them.
 
+        Args:
+            index_name: Name of the index
+            objects: Object data keyed by object ID
+            max_concurrency: Maximum requests in flight
+
+        Returns:
+            Responses from Algolia, in the order of objects
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def add_or_update(object_id: str, obj: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.add_or_update_object(index_name, object_id, obj)
+
+        return await asyncio.gather(
+            *[add_or_update(object_id, obj) for object_id, obj in objects.items()]
+        )
+
+    @_algolia_call("delete_object")
     async def delete_object(self, index_name: str, object_id: str) -> Dict[str, Any]:
         """Delete an object by ID.
 
@@ -204,15 +579,13 @@ class AlgoliaService:
         Returns:
             Response from Algolia
         """
-        try:
-            index = self.client.init_index(index_name)
-            response = index.delete_object(object_id)
-            logger.debug(f"Object deleted from {index_name}")
-            return response
-        except Exception as e:
-            logger.error(f"Error deleting object from {index_name}: {e}")
-            raise
+        index = self._index(index_name)
+        response = await self._retry(index.delete_object, object_id)
+        self.invalidate(index_name)
+        logger.debug("Object deleted from %s", index_name)
+        return response
 
+    @_algolia_call("delete_by")
     async def delete_by(
         self, index_name: str, filters: str
     ) -> Dict[str, Any]:
@@ -225,15 +598,13 @@ class AlgoliaService:
         Returns:
             Response from Algolia
         """
-        try:
-            index = self.client.init_index(index_name)
-            response = index.delete_by({"filters": filters})
-            logger.debug(f"Objects deleted from {index_name} by filter")
-            return response
-        except Exception as e:
-            logger.error(f"Error deleting by filter in {index_name}: {e}")
-            raise
+        index = self._index(index_name)
+        response = await self._retry(index.delete_by, {"filters": filters})
+        self.invalidate(index_name)
+        logger.debug("Objects deleted from %s by filter", index_name)
+        return response
 
+    @_algolia_call("clear_objects")
     async def clear_objects(self, index_name: str) -> Dict[str, Any]:
         """Clear all objects from an index.
 
@@ -243,15 +614,13 @@ class AlgoliaService:
         Returns:
             Response from Algolia
         """
-        try:
-            index = self.client.init_index(index_name)
-            response = index.clear_objects()
-            logger.debug(f"Index cleared: {index_name}")
-            return response
-        except Exception as e:
-            logger.error(f"Error clearing index {index_name}: {e}")
-            raise
+        index = self._index(index_name)
+        response = await self._retry(index.clear_objects)
+        self.invalidate(index_name)
+        logger.debug("Index cleared: %s", index_name)
+        return response
 
+    @_algolia_call("partial_update_object")
     async def partial_update_object(
         self, index_name: str, object_id: str, attributes: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -265,18 +634,16 @@ class AlgoliaService:
         Returns:
             Response from Algolia
         """
-        try:
-            index = self.client.init_index(index_name)
-            response = index.partial_update_object({
-                "objectID": object_id,
-                **attributes,
-            })
-            logger.debug(f"Object partially updated in {index_name}")
-            return response
-        except Exception as e:
-            logger.error(f"Error partially updating object in {index_name}: {e}")
-            raise
-
+        index = self._index(index_name)
+        response = await self._retry(index.partial_update_object, {
+            "objectID": object_id,
+            **attributes,
+        })
+        self.invalidate(index_name)
+        logger.debug("Object partially updated in %s", index_name)
+        return response
+
+    @_algolia_call("get_objects")
     async def get_objects(
         self, requests: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
@@ -288,24 +655,59 @@ class AlgoliaService:
         Returns:
             Response from Algolia with requested objects
         """
+        response = await asyncio.to_thread(self.client.multiple_get_objects, requests)
+        logger.debug("Retrieved %s objects", len(requests))
+        return response
+
+    @_algolia_call("search_multiple_queries")
+    async def search_multiple_queries(
+        self, queries: List[Dict[str, Any]], strategy: str = "none"
+    ) -> Dict[str, Any]:
+        """Run several queries, possibly on different indices, in one request.
+
+        Args:
+            queries: List of query dicts with indexName, query and other parameters
+            strategy: "none" to run all queries, or "stopIfEnoughMatches" to stop
+                once earlier queries return enough hits
+
+        Returns:
+            Response from Algolia with one result per query
+        """
+        response = await asyncio.to_thread(
+            self.client.multiple_queries, queries, {"strategy": strategy}
+        )
+        logger.debug("Ran %s queries", len(queries))
+        return response
+
+    @_algolia_call("index_exists")
+    async def index_exists(self, index_name: str) -> bool:
+        """Check whether an index exists by fetching only its settings.
+
+        Args:
+            index_name: Name of the index
+
+        Returns:
+            True if the index exists
+        """
         try:
-            response = self.client.get_objects(requests)
-            logger.debug(f"Retrieved {len(requests)} objects")
-            return response
-        except Exception as e:
-            logger.error(f"Error getting multiple objects: {e}")
+            await asyncio.to_thread(self._index(index_name).get_settings)
+            return True
+        except RequestException as e:
+            if getattr(e, "status_code", None) == 404:
+                return False
             raise
 
+    @_algolia_call("list_indices")
     async def list_indices(self) -> Dict[str, Any]:
         """List all indices.
 
         Returns:
             Dictionary containing list of indices
         """
-        try:
-            response = self.client.list_indices()
-            logger.debug(f"Retrieved {len(response.get('items', []))} indices")
-            return response
-        except Exception as e:
-            logger.error(f"Error listing indices: {e}")
-            raise
+        cached = self._indices_cache.get("indices")
+        if cached is not None:
+            return cached
+        response = await asyncio.to_thread(self.client.list_indices)
+        self._indices_cache["indices"] = response
+        logger.debug("Retrieved %s indices", len(response.get('items', [])))
+        return response
@@ -1,6 +1,8 @@
 """Algolia search service for semantic and full-text search."""
 
+import asyncio
 import os
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional
 
 try:
@@ -11,6 +13,32 @@ except ImportError:
     # Fallback for different API versions
     SearchClient = None  # type: ignore
 
+# Objects sent per batch request, as recommended by Algolia
+SAVE_BATCH_SIZE = 1000
+
+# Search parameters shared by every query; per-call options override them
+_DEFAULT_SEARCH_PARAMS = MappingProxyType({
+    "hitsPerPage": 20,
+    "page": 0,
+    "attributesToRetrieve": ["*"],
+    "typoTolerance": True,
+    "ignorePlurals": True,
+    "removeStopWords": True,
+    "queryType": "prefixNone",
+    "attributesToHighlight": ["*"],
+    "highlightPreTag": "<em>",
+    "highlightPostTag": "</em>",
+    "analytics": True,
+    "clickAnalytics": True,
+    "enablePersonalization": False,
+    "distinct": 1,
+    "facets": ["*"],
+    "minWordSizefor1Typo": 1,
+    "minWordSizefor2Typos": 3,
+    "advancedSyntax": True,
+    "removeWordsIfNoResults": "lastWords",
+})
+
 
 class AlgoliaService:
     """Service for interacting with Algolia search."""
@@ -44,6 +72,21 @@ class AlgoliaService:
             )
 
         self.client = SearchClient.create(self.application_id, self.api_key)
+        self._indices: Dict[str, Any] = {}
+
+    def _index(self, index_name: str) -> Any:
+        """Get cached index handle, creating it on first use.
+
+        Args:
+            index_name: Name of the index.
+
+        Returns:
+            Index handle.
+        """
+        index = self._indices.get(index_name)
+        if index is None:
+            index = self._indices[index_name] = self.client.init_index(index_name)
+        return index
 
     async def search_single_index(
         self,
@@ -63,30 +106,9 @@ class AlgoliaService:
         Returns:
             Search results dictionary.
         """
-        default_params = {
-            "hitsPerPage": 20,
-            "page": 0,
-            "attributesToRetrieve": ["*"],
-            "typoTolerance": True,
-            "ignorePlurals": True,
-            "removeStopWords": True,
-            "queryType": "prefixNone",
-            "attributesToHighlight": ["*"],
-            "highlightPreTag": "<em>",
-            "highlightPostTag": "</em>",
-            "analytics": True,
-            "clickAnalytics": True,
-            "enablePersonalization": False,
-            "distinct": 1,
-            "facets": ["*"],
-            "minWordSizefor1Typo": 1,
-            "minWordSizefor2Typos": 3,
-            "advancedSyntax": True,
-            "removeWordsIfNoResults": "lastWords",
-        }
 
         merged_params = {
-            **default_params,
+            **_DEFAULT_SEARCH_PARAMS,
             "query": query,
             "getRankingInfo": True,
         }
@@ -94,8 +116,8 @@ class AlgoliaService:
         if options and "queryParameters" in options:
             merged_params.update(options["queryParameters"])
 
-        index = self.client.init_index(index_name)
-        results = index.search(query, merged_params)
+        index = self._index(index_name)
+        results = await asyncio.to_thread(index.search, query, merged_params)
 
         return results
 
@@ -113,8 +135,32 @@ class AlgoliaService:
         Returns:
             Operation result.
         """
-        index = self.client.init_index(index_name)
-        return index.save_object(obj)
+        index = self._index(index_name)
+        return await asyncio.to_thread(index.save_object, obj)
+
+    async def save_objects(
+        self,
+        index_name: str,
+        objs: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Save objects to index in batch requests.
+
+        Args:
+            index_name: Name of the index.
+            objs: Objects to save; objects without objectID get one generated.
+
+        Returns:
+            Operation result for each batch.
+        """
+        index = self._index(index_name)
+        return [
+            await asyncio.to_thread(
+                index.save_objects,
+                objs[start:start + SAVE_BATCH_SIZE],
+                {"autoGenerateObjectIDIfNotExist": True},
+            )
+            for start in range(0, len(objs), SAVE_BATCH_SIZE)
+        ]
 
     async def get_object(
         self,
@@ -132,12 +178,12 @@ class AlgoliaService:
         Returns:
             Retrieved object.
         """
-        index = self.client.init_index(index_name)
+        index = self._index(index_name)
         params = {}
         if attributes_to_retrieve:
             params["attributesToRetrieve"] = attributes_to_retrieve
 
-        return index.get_object(object_id, params)
+        return await asyncio.to_thread(index.get_object, object_id, params)
 
     async def add_or_update_object(
         self,
@@ -155,9 +201,9 @@ class AlgoliaService:
         Returns:
             Operation result.
         """
-        index = self.client.init_index(index_name)
+        index = self._index(index_name)
         obj["objectID"] = object_id
-        return index.save_object(obj)
+        return await asyncio.to_thread(index.save_object, obj)
 
     async def delete_object(
         self,
@@ -173,8 +219,8 @@ class AlgoliaService:
         Returns:
             Operation result.
         """
-        index = self.client.init_index(index_name)
-        return index.delete_object(object_id)
+        index = self._index(index_name)
+        return await asyncio.to_thread(index.delete_object, object_id)
 
     async def delete_by(
         self,
@@ -190,8 +236,8 @@ class AlgoliaService:
         Returns:
             Operation result.
         """
-        index = self.client.init_index(index_name)
-        return index.delete_by({"filters": filters})
+        index = self._index(index_name)
+        return await asyncio.to_thread(index.delete_by, {"filters": filters})
 
     async def clear_objects(
         self,
@@ -205,8 +251,8 @@ class AlgoliaService:
         Returns:
             Operation result.
         """
-        index = self.client.init_index(index_name)
-        return index.clear_objects()
+        index = self._index(index_name)
+        return await asyncio.to_thread(index.clear_objects)
 
     async def partial_update_object(
         self,
@@ -224,9 +270,9 @@ class AlgoliaService:
         Returns:
             Operation result.
         """
-        index = self.client.init_index(index_name)
+        index = self._index(index_name)
         attributes["objectID"] = object_id
-        return index.partial_update_object(attributes)
+        return await asyncio.to_thread(index.partial_update_object, attributes)
 
     async def get_objects(
         self,
@@ -240,16 +286,25 @@ class AlgoliaService:
         Returns:
             Retrieved objects.
         """
-        results = []
-        for req in requests:
-            index = self.client.init_index(req["indexName"])
-            obj = index.get_object(
-                req["objectID"],
-                req.get("attributesToRetrieve"),
-            )
-            results.append(obj)
+        return await asyncio.to_thread(self.client.multiple_get_objects, requests)
 
-        return {"results": results}
+    async def search_multiple_queries(
+        self,
+        queries: List[Dict[str, Any]],
+        strategy: str = "none",
+    ) -> Dict[str, Any]:
+        """Run several queries, possibly on different indices, in one request.
+
+        Args:
+            queries: List of query dicts with indexName, query, etc.
+            strategy: "none" or "stopIfEnoughMatches".
+
+        Returns:
+            Search results for each query.
+        """
+        return await asyncio.to_thread(
+            self.client.multiple_queries, queries, {"strategy": strategy}
+        )
 
     async def list_indices(
         self,
@@ -259,4 +314,4 @@ class AlgoliaService:
         Returns:
             Dictionary with indices information.
         """
-        return self.client.list_indices()
+        return await asyncio.to_thread(self.client.list_indices)
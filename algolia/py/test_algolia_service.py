@@ -0,0 +1,78 @@
+"""Tests for the search cache in the Algolia service."""
+
+import json
+import unittest
+from unittest import mock
+
+from algolia_service import AlgoliaService
+
+
+def _key(query: str = "Hello", **params):
+    # _canonical_key reads no client state, so no credentials are needed
+    service = AlgoliaService.__new__(AlgoliaService)
+    return service._canonical_key("docs", query, params)
+
+
+class CanonicalKeyTest(unittest.TestCase):
+    def test_query_case_and_whitespace_are_ignored(self) -> None:
+        self.assertEqual(_key("  Hello   World "), _key("hello world"))
+
+    def test_query_punctuation_is_kept(self) -> None:
+        self.assertNotEqual(_key('"hello world"'), _key("hello world"))
+        self.assertNotEqual(_key("hello -world"), _key("hello world"))
+
+    def test_and_filters_are_reordered(self) -> None:
+        self.assertEqual(
+            _key(filters="lang:en AND type:post AND year > 2020"),
+            _key(filters="year > 2020 AND lang:en AND type:post"),
+        )
+
+    def test_or_filters_are_reordered(self) -> None:
+        self.assertEqual(
+            _key(filters="tag:b OR tag:a"),
+            _key(filters="tag:a OR tag:b"),
+        )
+
+    def test_mixed_and_grouped_filters_keep_their_order(self) -> None:
+        self.assertNotEqual(
+            _key(filters="a:1 AND b:2 OR c:3"),
+            _key(filters="b:2 AND a:1 OR c:3"),
+        )
+        self.assertNotEqual(
+            _key(filters="(a:1 OR b:2) AND c:3"),
+            _key(filters="c:3 AND (a:1 OR b:2)"),
+        )
+
+    def test_filter_values_are_not_lowercased(self) -> None:
+        self.assertNotEqual(_key(filters="author:Alice"), _key(filters="author:alice"))
+
+    def test_analytics_params_are_dropped(self) -> None:
+        index_name, params = _key(analytics=False, clickAnalytics=True, hitsPerPage=5)
+
+        self.assertEqual(index_name, "docs")
+        self.assertEqual(json.loads(params), {"hitsPerPage": 5, "query": "hello"})
+
+    def test_other_params_change_the_key(self) -> None:
+        self.assertNotEqual(_key(hitsPerPage=5), _key(hitsPerPage=10))
+
+
+class SearchCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def test_cached_results_are_not_shared(self) -> None:
+        service = AlgoliaService("app", "key")
+        index = mock.Mock()
+        index.search.return_value = {"hits": [{"objectID": "1", "title": "a"}], "nbHits": 1}
+        service._indices["docs"] = index
+
+        first = await service.search_single_index("docs", "hello")
+        first.hits[0]["title"] = "changed"
+        first.hits.append({"objectID": "2"})
+        second = await service.search_single_index("docs", "hello")
+        second.hits.clear()
+        third = await service.search_single_index("docs", "hello")
+
+        index.search.assert_called_once()
+        self.assertEqual(third.hits, [{"objectID": "1", "title": "a"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
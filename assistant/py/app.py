@@ -1,7 +1,6 @@
 """Example application using Assistant service."""
 
 import asyncio
-import json
 import logging
 from typing import Dict, Any
 from uuid import uuid4
@@ -17,6 +16,7 @@ from types import (
 )
 from assistant_service import AssistantService
 from openai_service import OpenAIService
+from json_utils import json_dumps
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -152,15 +152,17 @@ async def main() -> None:
 
     # Execute the assistant loop
     user_message = "Play my favorite music"
-    logger.info(f"User message: {user_message}")
+    logger.info("User message: %s", user_message)
 
     try:
         final_state = await assistant.execute_loop(user_message, max_steps=5)
         logger.info("Assistant loop completed")
-        logger.info(f"Final state: {json.dumps(final_state.to_dict(), indent=2)}")
+        logger.info("Final state: %s", json_dumps(final_state.to_dict(), indent=True))
     except Exception as e:
-        logger.error(f"Error executing assistant loop: {e}")
+        logger.error("Error executing assistant loop: %s", e)
         raise
+    finally:
+        await openai_service.aclose()
 
 
 if __name__ == "__main__":
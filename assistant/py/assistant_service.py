@@ -1,10 +1,12 @@
 """Assistant service with planning and reasoning capabilities."""
 
+import asyncio
+import copy
+import functools
+import inspect
 import logging
-import json
-from typing import Any, Callable, Dict, Optional
-from uuid import uuid4
-from datetime import datetime
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .types import (
     State,
@@ -16,11 +18,62 @@ from .types import (
     Thoughts,
     Tool,
     MemoryCategory,
+    now_iso,
 )
-from .openai_service import OpenAIService
+from .json_utils import parse_json_object
+from .openai_service import BatchingOpenAIService, OpenAIService
+from .uuid_utils import fast_uuid4
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of parsed plans kept for repeated requests
+PLAN_CACHE_SIZE = 128
+
+# Non-JSON text tolerated before a streamed object, e.g. a code fence or a
+# short preamble from models without JSON mode
+JSON_PREFIX_LIMIT = 200
+
+# Phase instructions. They follow the session context, which is identical for
+# every request in a session, so provider-side prompt caching can reuse it.
+ENVIRONMENT_PROMPT = """Analyze the current environment and context.
+Return JSON: {"result": "<analysis>"}"""
+
+PERSONALITY_PROMPT = """Analyze how your personality affects your response.
+Return JSON: {"result": "<analysis>"}"""
+
+MEMORY_PROMPT = """Analyze relevant memories for this context.
+Return JSON: {"result": "<analysis>"}"""
+
+TOOLS_PROMPT = """Analyze which tools might be useful.
+Return JSON: {"result": "<analysis>"}"""
+
+PLAN_PROMPT = """Plan the next step for the user's request.
+Update the task list, keeping the uuid of existing tasks and omitting it for new ones.
+Then pick the next action for a pending task and write the payload for its tool.
+Return JSON: {"result": {"tasks": [{"uuid": "...", "name": "task_name", "description": "..."}], "action": {"task_uuid": "...", "task_name": "...", "name": "...", "tool_name": "...", "description": "..."}, "payload": {...payload...}}}"""
+
+
+def _cached_prompt(
+    version: Callable[["AssistantService"], Tuple[Any, ...]]
+) -> Callable[[Callable[["AssistantService"], str]], Callable[["AssistantService"], str]]:
+    """Cache a prompt builder's output until the state it reads changes.
+
+    Args:
+        version: Returns a cheap tag of the state the prompt depends on
+    """
+    def decorator(build: Callable[["AssistantService"], str]) -> Callable[["AssistantService"], str]:
+        name = build.__name__
+
+        @functools.wraps(build)
+        def wrapper(self: "AssistantService") -> str:
+            tag = version(self)
+            cached = self._prompt_cache.get(name)
+            if cached is None or cached[0] != tag:
+                cached = self._prompt_cache[name] = (tag, build(self))
+            return cached[1]
+        return wrapper
+    return decorator
+
 
 class AssistantService:
     """Assistant service for multi-phase reasoning and task execution."""
@@ -29,30 +82,44 @@ class AssistantService:
         self,
         state: State,
         openai_service: Optional[OpenAIService] = None,
+        batched: bool = False,
     ) -> None:
         """Initialize assistant service.
 
         Args:
             state: Initial assistant state
             openai_service: OpenAI service instance
+            batched: Coalesce concurrent requests when creating the OpenAI service
         """
         self.state = state
-        self.openai = openai_service or OpenAIService()
-        self.tool_handlers: Dict[str, Callable] = {}
+        self.openai = openai_service or (
+            BatchingOpenAIService() if batched else OpenAIService()
+        )
+        # Handlers are stored with whether they are coroutine functions
+        self.tool_handlers: Dict[str, Tuple[Callable, bool]] = {}
+        self._prompt_cache: Dict[str, Tuple[Tuple[Any, ...], str]] = {}
+        self._indexed_tasks: Optional[List[Task]] = None
+        self._tasks_by_uuid: Dict[str, Task] = {}
+        self._actions_by_uuid: Dict[str, Action] = {}
+        self._conversation_uuid = fast_uuid4()
+        self._plan_cache: OrderedDict[Tuple[str, ...], Dict[str, Any]] = OrderedDict()
         
-        logger.info(f"Initialized assistant: {state.config.ai_name}")
+        logger.info("Initialized assistant: %s", state.config.ai_name)
 
     def register_tool_handler(
         self, tool_name: str, handler: Callable[[Dict[str, Any]], ActionResult]
     ) -> None:
         """Register a tool handler.
 
+        Synchronous handlers run in a worker thread so they don't block the
+        event loop.
+
         Args:
             tool_name: Name of the tool
-            handler: Async function that takes payload dict and returns ActionResult
+            handler: Sync or async function that takes payload dict and returns ActionResult
         """
-        self.tool_handlers[tool_name] = handler
-        logger.debug(f"Registered handler for tool: {tool_name}")
+        self.tool_handlers[tool_name] = (handler, inspect.iscoroutinefunction(handler))
+        logger.debug("Registered handler for tool: %s", tool_name)
 
     async def thinking_phase(self, user_message: str) -> None:
         """Execute thinking phase.
@@ -64,85 +131,156 @@ class AssistantService:
         """
         logger.info("Starting thinking phase")
 
-        # Environment analysis
-        env_response = await self.openai.completion(
-            messages=[
-                {"role": "system", "content": self._prompt_environment()},
-                {"role": "user", "content": user_message},
-            ],
-            json_mode=True,
+        # The four analyses are independent, so their requests run concurrently
+        (
+            self.state.thoughts.environment,
+            self.state.thoughts.personality,
+            self.state.thoughts.memory,
+            self.state.thoughts.tools,
+        ) = await asyncio.gather(
+            self._analyze(ENVIRONMENT_PROMPT, user_message),
+            self._analyze(PERSONALITY_PROMPT, user_message),
+            self._analyze(MEMORY_PROMPT, user_message),
+            self._analyze(TOOLS_PROMPT, user_message),
         )
-        env_analysis = json.loads(env_response.choices[0].message.content or "{}")
-        self.state.thoughts.environment = env_analysis.get("result", "")
-
-        # Personality analysis
-        pers_response = await self.openai.completion(
-            messages=[
-                {"role": "system", "content": self._prompt_personality()},
-                {"role": "user", "content": user_message},
-            ],
+
+        logger.debug("Thinking phase completed")
+
+    async def _analyze(self, instruction: str, user_message: str) -> str:
+        """Run one thinking-phase analysis.
+
+        Args:
+            instruction: Analysis instruction
+            user_message: The user's message
+
+        Returns:
+            The "result" field of the JSON response
+        """
+        response = await self.openai.completion(
+            messages=self._messages(instruction, user_message),
+            model=self.state.config.thinking_model,
             json_mode=True,
         )
-        pers_analysis = json.loads(pers_response.choices[0].message.content or "{}")
-        self.state.thoughts.personality = pers_analysis.get("result", "")
-
-        # Memory analysis
-        mem_response = await self.openai.completion(
-            messages=[
-                {"role": "system", "content": self._prompt_memory()},
-                {"role": "user", "content": user_message},
-            ],
+        analysis = parse_json_object(response.choices[0].message.content)
+        return analysis.get("result", "")
+
+    async def _stream_json(self, messages: List[Dict[str, str]], model: str) -> Dict[str, Any]:
+        """Stream a JSON-mode completion and parse it.
+
+        Output wrapped in a code fence or prefixed by a short preamble is
+        read in full and repaired by parse_json_object. Reading stops early
+        only when no object has started within JSON_PREFIX_LIMIT characters,
+        since such output cannot become JSON.
+
+        Args:
+            messages: Request messages
+            model: Model to use
+
+        Returns:
+            Parsed JSON object, or {} if the output was malformed
+        """
+        stream = await self.openai.completion(
+            messages=messages,
+            model=model,
             json_mode=True,
+            stream=True,
         )
-        mem_analysis = json.loads(mem_response.choices[0].message.content or "{}")
-        self.state.thoughts.memory = mem_analysis.get("result", "")
-
-        # Tools analysis
-        tools_response = await self.openai.completion(
-            messages=[
-                {"role": "system", "content": self._prompt_tools()},
-                {"role": "user", "content": user_message},
-            ],
-            json_mode=True,
+        # o1 models don't support streaming and return a whole completion
+        if not hasattr(stream, "__aiter__"):
+            return parse_json_object(stream.choices[0].message.content)
+
+        parts: List[str] = []
+        started = False
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            parts.append(delta)
+            if started:
+                continue
+            prefix = "".join(parts).lstrip()
+            if "{" in prefix:
+                started = True
+            elif len(prefix) > JSON_PREFIX_LIMIT:
+                logger.debug(
+                    "Stopping JSON stream: no object within %d characters: %.80r",
+                    JSON_PREFIX_LIMIT,
+                    prefix,
+                )
+                await stream.close()
+                break
+        return parse_json_object("".join(parts))
+
+    async def _plan(self, user_message: str, tasks_text: str) -> Dict[str, Any]:
+        """Get the plan for a request, reusing the plan of an identical one.
+
+        Plans are keyed on the normalized message, the session context
+        (environment, personality, memories, tools), the model and the
+        current task list. New tasks in a reused plan carry no uuid, so they
+        still get fresh ones.
+
+        Args:
+            user_message: The user's message
+            tasks_text: Current task list as shown to the model
+
+        Returns:
+            The "result" object of the plan
+        """
+        key = (
+            " ".join(user_message.lower().split()),
+            self._session_context(),
+            self.state.config.planning_model,
+            tasks_text,
+        )
+        cached = self._plan_cache.get(key)
+        if cached is not None:
+            self._plan_cache.move_to_end(key)
+            logger.debug("Plan cache hit")
+            return copy.deepcopy(cached)
+
+        plan = await self._stream_json(
+            self._messages(f"{PLAN_PROMPT}\nCurrent tasks:\n{tasks_text}", user_message),
+            self.state.config.planning_model,
         )
-        tools_analysis = json.loads(tools_response.choices[0].message.content or "{}")
-        self.state.thoughts.tools = tools_analysis.get("result", "")
+        plan = plan.get("result")
+        if not isinstance(plan, dict) or not plan:
+            return {}
 
-        logger.debug("Thinking phase completed")
+        self._plan_cache[key] = copy.deepcopy(plan)
+        if len(self._plan_cache) > PLAN_CACHE_SIZE:
+            self._plan_cache.popitem(last=False)
+        return plan
 
     async def planning_phase(self, user_message: str) -> None:
         """Execute planning phase.
 
-        Creates tasks and actions from user request.
+        Creates tasks, the next action and its tool payload from the user
+        request in a single completion.
 
         Args:
             user_message: The user's message
         """
         logger.info("Starting planning phase")
 
-        # Task planning
-        task_response = await self.openai.completion(
-            messages=[
-                {"role": "system", "content": self._prompt_task()},
-                {"role": "user", "content": user_message},
-            ],
-            json_mode=True,
-        )
-        task_analysis = json.loads(task_response.choices[0].message.content or "{}")
-        tasks = task_analysis.get("result", [])
+        tasks_text = "\n".join(
+            f"- {t.uuid}: {t.name} ({t.status})" for t in self.state.tasks
+        ) or "none"
+        plan = await self._plan(user_message, tasks_text)
+        tasks = plan.get("tasks", [])
 
         # Update or create tasks
+        now = now_iso()
         updated_tasks = []
         for task_data in tasks:
             if "uuid" in task_data:
                 # Update existing
-                existing = next(
-                    (t for t in self.state.tasks if t.uuid == task_data["uuid"]), None
-                )
+                existing = self._task(task_data["uuid"])
                 if existing and existing.status == "pending":
                     existing.name = task_data.get("name", existing.name)
                     existing.description = task_data.get("description", existing.description)
-                    existing.updated_at = datetime.now().isoformat()
+                    existing.touch(now)
                     updated_tasks.append(existing)
                 elif existing:
                     updated_tasks.append(existing)
@@ -150,46 +288,46 @@ class AssistantService:
                 # Create new
                 updated_tasks.append(
                     Task(
-                        uuid=str(uuid4()),
-                        conversation_uuid=str(uuid4()),
+                        uuid=fast_uuid4(),
+                        conversation_uuid=self._conversation_uuid,
                         name=task_data.get("name", "Untitled"),
                         description=task_data.get("description", ""),
                         status="pending",
+                        created_at=now,
+                        updated_at=now,
                     )
                 )
 
         self.state.tasks = updated_tasks
+        self._index_tasks()
 
         # Set current task
         pending_task = next((t for t in self.state.tasks if t.status == "pending"), None)
         if pending_task:
             self.state.config.task = pending_task.uuid
 
-        # Action planning
-        action_response = await self.openai.completion(
-            messages=[
-                {"role": "system", "content": self._prompt_action()},
-                {"role": "user", "content": user_message},
-            ],
-            json_mode=True,
-        )
-        action_analysis = json.loads(action_response.choices[0].message.content or "{}")
-        action_data = action_analysis.get("result")
+        action_data = plan.get("action")
 
         if action_data:
-            task_to_update = next(
-                (t for t in self.state.tasks if t.uuid == action_data.get("task_uuid")),
-                None,
+            # New tasks get their uuid only now, so fall back to the task name
+            # and then to the current pending task
+            task_to_update = self._task(action_data.get("task_uuid")) or next(
+                (t for t in self.state.tasks if t.name == action_data.get("task_name")),
+                pending_task,
             )
             if task_to_update:
                 action = Action(
-                    uuid=str(uuid4()),
+                    uuid=fast_uuid4(),
                     task_uuid=task_to_update.uuid,
                     name=action_data.get("name", ""),
                     tool_name=action_data.get("tool_name", ""),
+                    payload=plan.get("payload") or {},
                     description=action_data.get("description", ""),
+                    created_at=now,
+                    updated_at=now,
                 )
                 task_to_update.actions = [action]
+                self._actions_by_uuid[action.uuid] = action
                 self.state.config.task = task_to_update.uuid
                 self.state.config.action = action.uuid
 
@@ -198,7 +336,7 @@ class AssistantService:
     async def action_phase(self, user_message: str) -> None:
         """Execute action phase.
 
-        Executes tools and handles results.
+        Executes the planned tool call with the payload from the planning phase.
 
         Args:
             user_message: The user's message
@@ -209,35 +347,26 @@ class AssistantService:
 
         logger.info("Starting action phase")
 
-        # Get tool use prompt
-        use_response = await self.openai.completion(
-            messages=[
-                {"role": "system", "content": self._prompt_use()},
-                {"role": "user", "content": user_message},
-            ],
-            json_mode=True,
-        )
-        use_analysis = json.loads(use_response.choices[0].message.content or "{}")
-        payload = use_analysis.get("result", {})
-
         # Get current action and execute
-        task = next(
-            (t for t in self.state.tasks if t.uuid == self.state.config.task), None
-        )
-        if task:
-            action = next(
-                (a for a in task.actions if a.uuid == self.state.config.action), None
-            )
-            if action:
-                action.payload = payload
-
-                # Execute tool
-                handler = self.tool_handlers.get(action.tool_name)
-                if handler:
-                    action.result = await handler(payload)
-                    logger.debug(f"Executed tool: {action.tool_name}")
+        action = self._current_action()
+        if action:
+            # Execute tool
+            entry = self.tool_handlers.get(action.tool_name)
+            if entry:
+                handler, is_async = entry
+                if is_async:
+                    result = await handler(action.payload)
                 else:
-                    logger.warning(f"No handler for tool: {action.tool_name}")
+                    result = await asyncio.to_thread(handler, action.payload)
+                    # Plain callables may still return an awaitable, e.g. a lambda
+                    # wrapping an async handler
+                    if inspect.isawaitable(result):
+                        result = await result
+                action.result = result
+                action.touch()
+                logger.debug("Executed tool: %s", action.tool_name)
+            else:
+                logger.warning("No handler for tool: %s", action.tool_name)
 
     async def execute_loop(self, user_message: str, max_steps: Optional[int] = None) -> State:
         """Execute the main assistant loop.
@@ -253,27 +382,30 @@ class AssistantService:
             self.state.config.max_steps = max_steps
 
         self.state.config.step = 0
+        # Tasks planned within one loop belong to the same conversation
+        self._conversation_uuid = fast_uuid4()
         self.state.messages.append({"role": "user", "content": user_message})
 
-        # Thinking phase
-        await self.thinking_phase(user_message)
+        # Planning does not read the thoughts, so the first step is planned
+        # while the thinking phase runs
+        if self.state.config.max_steps > 0:
+            await asyncio.gather(
+                self.thinking_phase(user_message), self.planning_phase(user_message)
+            )
+        else:
+            await self.thinking_phase(user_message)
 
         # Main loop
         while self.state.config.step < self.state.config.max_steps:
-            logger.info(f"Step {self.state.config.step + 1}/{self.state.config.max_steps}")
+            logger.info("Step %d/%d", self.state.config.step + 1, self.state.config.max_steps)
 
-            await self.planning_phase(user_message)
+            if self.state.config.step > 0:
+                await self.planning_phase(user_message)
             await self.action_phase(user_message)
 
             # Check if we should continue
-            task = next(
-                (t for t in self.state.tasks if t.uuid == self.state.config.task), None
-            )
-            action = (
-                next((a for a in task.actions if a.uuid == self.state.config.action), None)
-                if task
-                else None
-            )
+            task = self._task(self.state.config.task)
+            action = self._current_action()
 
             if not action or action.tool_name == "final_answer":
                 logger.info("Loop complete")
@@ -282,64 +414,118 @@ class AssistantService:
             # Update task status and find next
             if task:
                 task.status = "completed"
+                task.touch()
                 next_task = next((t for t in self.state.tasks if t.status == "pending"), None)
                 if next_task:
                     self.state.config.task = next_task.uuid
                     self.state.config.action = next_task.actions[0].uuid if next_task.actions else None
                 else:
+                    # Nothing is left to act on, so another step would only spend LLM calls
                     self.state.config.task = None
                     self.state.config.action = None
+                    self.state.config.step += 1
+                    logger.info("No pending tasks left")
+                    break
 
             self.state.config.step += 1
 
         return self.state
 
-    # Prompt templates
-    def _prompt_environment(self) -> str:
-        """Environment analysis prompt."""
-        return f"""You are {self.state.config.ai_name}, an AI assistant.
-Analyze the current environment and context.
-Environment: {self.state.config.environment}
-Return JSON: {{"result": "<analysis>"}}"""
-
-    def _prompt_personality(self) -> str:
-        """Personality analysis prompt."""
-        return f"""You are {self.state.config.ai_name}, an AI assistant with this personality:
-{self.state.config.personality}
-Analyze how your personality affects your response.
-Return JSON: {{"result": "<analysis>"}}"""
-
-    def _prompt_memory(self) -> str:
-        """Memory analysis prompt."""
-        memories_text = "\n".join(
-            [f"- {m.name} ({m.category}): {m.content}" for m in self.state.memories]
-        )
-        return f"""You have the following memories:
-{memories_text}
-Analyze relevant memories for this context.
-Return JSON: {{"result": "<analysis>"}}"""
-
-    def _prompt_tools(self) -> str:
-        """Tools analysis prompt."""
-        tools_text = "\n".join(
-            [f"- {t.name}: {t.description}" for t in self.state.config.tools]
+    async def execute_loop_batch(
+        self, user_messages: List[str], max_steps: Optional[int] = None
+    ) -> List[State]:
+        """Execute the main loop for several users concurrently.
+
+        Each message runs on its own copy of this service's state and tool
+        handlers, sharing this service's OpenAI client, response cache and
+        plan cache.
+
+        Args:
+            user_messages: One message per user
+            max_steps: Maximum steps (uses config.max_steps if not provided)
+
+        Returns:
+            Final state for each message, in input order
+        """
+        services = []
+        for _ in user_messages:
+            service = AssistantService(copy.deepcopy(self.state), self.openai)
+            service.tool_handlers = dict(self.tool_handlers)
+            service._plan_cache = self._plan_cache
+            services.append(service)
+
+        return list(await asyncio.gather(*(
+            service.execute_loop(message, max_steps)
+            for service, message in zip(services, user_messages)
+        )))
+
+    def _index_tasks(self) -> None:
+        """Rebuild the task and action indexes when state.tasks was replaced."""
+        tasks = self.state.tasks
+        if tasks is self._indexed_tasks and len(tasks) == len(self._tasks_by_uuid):
+            return
+        self._tasks_by_uuid = {t.uuid: t for t in tasks}
+        self._actions_by_uuid = {a.uuid: a for t in tasks for a in t.actions}
+        self._indexed_tasks = tasks
+
+    def _task(self, uuid: Optional[str]) -> Optional[Task]:
+        """Look up a task by uuid."""
+        if not uuid:
+            return None
+        self._index_tasks()
+        return self._tasks_by_uuid.get(uuid)
+
+    def _current_action(self) -> Optional[Action]:
+        """Look up the action selected in config, if it belongs to the current task."""
+        task = self._task(self.state.config.task)
+        action = self._actions_by_uuid.get(self.state.config.action or "") if task else None
+        if action and action.task_uuid == task.uuid:
+            return action
+        return None
+
+    @_cached_prompt(lambda self: tuple(self.state.memories))
+    def _memories_text(self) -> str:
+        """Memories listed in a stable order."""
+        return "\n".join(
+            f"- {m.name} ({m.category}): {m.content}"
+            for m in sorted(self.state.memories, key=lambda m: (m.category, m.name))
         )
-        return f"""You have access to these tools:
-{tools_text}
-Analyze which tools might be useful.
-Return JSON: {{"result": "<analysis>"}}"""
-
-    def _prompt_task(self) -> str:
-        """Task planning prompt."""
-        return """Create tasks to accomplish the user's request.
-Return JSON: {"result": [{"name": "task_name", "description": "..."}]}"""
-
-    def _prompt_action(self) -> str:
-        """Action planning prompt."""
-        return """Plan actions for the current task.
-Return JSON: {"result": {"task_uuid": "...", "name": "...", "tool_name": "..."}}"""
-
-    def _prompt_use(self) -> str:
-        """Tool use prompt."""
-        return """Generate the payload for the tool call.
-Return JSON: {"result": {...payload...}}"""
+
+    @_cached_prompt(lambda self: tuple(self.state.config.tools))
+    def _tools_text(self) -> str:
+        """Available tools, one per line."""
+        return "\n".join(f"- {t.name}: {t.description}" for t in self.state.config.tools)
+
+    @_cached_prompt(lambda self: (
+        self.state.config.ai_name,
+        self.state.config.environment,
+        self.state.config.personality,
+        self._memories_text(),
+        self._tools_text(),
+    ))
+    def _session_context(self) -> str:
+        """Context shared by every prompt in a session."""
+        config = self.state.config
+        return f"""You are {config.ai_name}, an AI assistant with this personality:
+{config.personality}
+Environment: {config.environment}
+You have the following memories:
+{self._memories_text()}
+You have access to these tools:
+{self._tools_text()}"""
+
+    def _messages(self, instruction: str, user_message: str) -> List[Dict[str, str]]:
+        """Build request messages with the shared session context first.
+
+        Args:
+            instruction: Phase-specific instruction
+            user_message: The user's message
+
+        Returns:
+            Messages for a completion request
+        """
+        return [
+            {"role": "system", "content": self._session_context()},
+            {"role": "system", "content": instruction},
+            {"role": "user", "content": user_message},
+        ]
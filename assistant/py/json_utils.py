@@ -0,0 +1,48 @@
+"""JSON helpers backed by orjson when it is installed."""
+import json
+import logging
+from typing import Any, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON from text or raw bytes, treating empty input as {}."""
+    if not data:
+        return {}
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data: Any, indent: bool = False) -> str:
+    """Serialize data to a JSON string, optionally indented by two spaces."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None).decode()
+    return json.dumps(data, indent=2 if indent else None)
+
+
+def parse_json_object(content: Optional[str]) -> Dict[str, Any]:
+    """Parse a model's JSON object without failing the loop on bad output.
+
+    Falls back to the outermost braces for responses wrapped in prose or
+    code fences (models without JSON mode), then to an empty object.
+    """
+    try:
+        data = json_loads(content)
+    except ValueError:
+        start, end = content.find("{"), content.rfind("}")
+        try:
+            data = json_loads(content[start:end + 1]) if 0 <= start < end else None
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            logger.warning("Repaired malformed JSON response: %.200r", content)
+        else:
+            logger.warning("Discarding malformed JSON response: %.200r", content)
+    return data if isinstance(data, dict) else {}
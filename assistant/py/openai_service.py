@@ -1,40 +1,115 @@
 """OpenAI integration for assistant module."""
 
+import asyncio
+import hashlib
+import itertools
+import json
 import logging
-from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Union
+import os
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 try:
+    import httpx
     import openai
     from openai.types.chat import ChatCompletion, ChatCompletionChunk, ChatCompletionMessageParam
 except ImportError:
+    httpx = None
     openai = None
     ChatCompletion = None
     ChatCompletionChunk = None
     ChatCompletionMessageParam = None
 
+__all__ = ["OpenAIService", "BatchingOpenAIService"]
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of completions kept in the exact-match response cache
+RESPONSE_CACHE_SIZE = 512
+
+# Connection pool for the async client, sized for concurrent thinking-phase requests
+HTTP_MAX_CONNECTIONS = 64
+HTTP_MAX_KEEPALIVE = 32
+HTTP_TIMEOUT = 60.0
+
 
 class OpenAIService:
     """OpenAI API wrapper for chat completions."""
 
-    def __init__(self, api_key: Optional[str] = None) -> None:
+    def __init__(self, api_key: Optional[str] = None, cache_enabled: Optional[bool] = None) -> None:
         """Initialize OpenAI service.
 
         Args:
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
+            cache_enabled: Reuse responses for identical requests with temperature 0
+                (defaults to ASSISTANT_RESPONSE_CACHE=1). While it is on,
+                non-streaming requests without a temperature are sent with 0.
         """
         if not openai:
             raise ImportError(
                 "openai package is required. Install with: pip install openai"
             )
         
-        if api_key:
-            openai.api_key = api_key
-        
-        self.client = openai.OpenAI()
+        self.client = openai.OpenAI(api_key=api_key)
+        self.async_client = openai.AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                ),
+                timeout=HTTP_TIMEOUT,
+            ),
+        )
+        if cache_enabled is None:
+            cache_enabled = os.getenv("ASSISTANT_RESPONSE_CACHE") == "1"
+        self.cache_enabled = cache_enabled
+        self._cache: OrderedDict[str, ChatCompletion] = OrderedDict()
         logger.info("Initialized OpenAI service")
 
+    async def aclose(self) -> None:
+        """Close the async client's connection pool."""
+        await self.async_client.close()
+
+    @staticmethod
+    def _request_kwargs(
+        messages: List[ChatCompletionMessageParam],
+        model: str,
+        stream: bool,
+        json_mode: bool,
+        max_tokens: int,
+        response_format: Optional[Dict[str, Any]] = None,
+        temperature: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Build chat completion arguments shared by the async and sync paths."""
+        # o1 models don't support streaming, json_mode, max_tokens, or temperature
+        if model in ("o1-mini", "o1-preview"):
+            return {"messages": messages, "model": model}
+        kwargs = {
+            "messages": messages,
+            "model": model,
+            "stream": stream,
+            "max_tokens": max_tokens,
+            "response_format": response_format
+            or ({"type": "json_object"} if json_mode else {"type": "text"}),
+        }
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+        return kwargs
+
+    def _cacheable(self, kwargs: Dict[str, Any]) -> bool:
+        """Whether a response to these completion arguments may be reused.
+
+        Only unsampled requests qualify: o1 models take no temperature and
+        always sample.
+        """
+        return self.cache_enabled and not kwargs.get("stream") and kwargs.get("temperature") == 0
+
+    def _cache_key(self, kwargs: Dict[str, Any]) -> str:
+        """Build an exact-match cache key for completion arguments."""
+        payload = json.dumps(kwargs, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
     async def completion(
         self,
         messages: List[ChatCompletionMessageParam],
@@ -42,6 +117,8 @@ class OpenAIService:
         stream: bool = False,
         json_mode: bool = False,
         max_tokens: int = 8096,
+        response_format: Optional[Dict[str, Any]] = None,
+        temperature: Optional[float] = None,
     ) -> Union[ChatCompletion, AsyncIterator[ChatCompletionChunk]]:
         """Get completion from OpenAI.
 
@@ -51,34 +128,43 @@ class OpenAIService:
             stream: Whether to stream the response
             json_mode: Whether to use JSON mode
             max_tokens: Maximum tokens in response
+            response_format: Explicit response format, e.g. a JSON schema; overrides json_mode
+            temperature: Sampling temperature; only temperature 0 is cached. Defaults
+                to 0 for non-streaming requests while the cache is on, otherwise
+                to the API default
 
         Returns:
             ChatCompletion or async iterator of chunks if streaming
         """
+        if temperature is None and self.cache_enabled and not stream:
+            # A cached response must not depend on sampling, so requests that
+            # leave the temperature to the API default are sent unsampled
+            temperature = 0
+        kwargs = self._request_kwargs(
+            messages, model, stream, json_mode, max_tokens, response_format, temperature
+        )
+        use_cache = self._cacheable(kwargs)
+        if use_cache:
+            key = self._cache_key(kwargs)
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                logger.debug("Completion cache hit for %s", model)
+                return cached
+
         try:
-            # o1 models don't support streaming, json_mode, or max_tokens
-            is_o1_model = model in ("o1-mini", "o1-preview")
-            
-            if is_o1_model:
-                response = self.client.chat.completions.create(
-                    messages=messages,
-                    model=model,
-                )
-            else:
-                response = self.client.chat.completions.create(
-                    messages=messages,
-                    model=model,
-                    stream=stream,
-                    max_tokens=max_tokens,
-                    response_format={"type": "json_object"} if json_mode else {"type": "text"},
-                )
-            
-            logger.debug(f"Completion request sent to {model}")
-            return response
+            response = await self.async_client.chat.completions.create(**kwargs)
+            logger.debug("Completion request sent to %s", model)
         except Exception as e:
-            logger.error(f"Error in OpenAI completion: {e}")
+            logger.error("Error in OpenAI completion: %s", e)
             raise
 
+        if use_cache:
+            self._cache[key] = response
+            if len(self._cache) > RESPONSE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return response
+
     def completion_sync(
         self,
         messages: List[ChatCompletionMessageParam],
@@ -87,7 +173,7 @@ class OpenAIService:
         json_mode: bool = False,
         max_tokens: int = 8096,
     ) -> Union[ChatCompletion, Iterator[ChatCompletionChunk]]:
-        """Synchronous wrapper for completion.
+        """Get completion from OpenAI using the blocking client.
 
         Args:
             messages: List of message dicts with role and content
@@ -99,10 +185,118 @@ class OpenAIService:
         Returns:
             ChatCompletion or iterator of chunks if streaming
         """
-        return self.completion(
-            messages=messages,
-            model=model,
-            stream=stream,
-            json_mode=json_mode,
-            max_tokens=max_tokens,
+        return self.client.chat.completions.create(
+            **self._request_kwargs(messages, model, stream, json_mode, max_tokens)
         )
+
+
+class BatchingOpenAIService(OpenAIService):
+    """OpenAI service that coalesces concurrent completion requests.
+
+    Non-streaming requests arriving within batch_window_ms of each other are
+    dispatched together, up to max_batch at a time. Identical requests in a
+    batch share one API call only when their response could be cached (see
+    OpenAIService.completion); sampled requests each get their own call.
+    The chat completions API takes one conversation per request, so a batch
+    goes out as concurrent requests; an inference server with continuous
+    batching (set via OPENAI_BASE_URL) schedules them as one batch.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache_enabled: Optional[bool] = None,
+        batch_window_ms: float = 10,
+        max_batch: int = 16,
+    ) -> None:
+        """Initialize batching OpenAI service.
+
+        Args:
+            api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
+            cache_enabled: Reuse responses for identical requests with temperature 0
+                (defaults to ASSISTANT_RESPONSE_CACHE=1)
+            batch_window_ms: How long to collect requests before dispatching
+            max_batch: Number of distinct requests that triggers an early dispatch
+        """
+        super().__init__(api_key, cache_enabled)
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch = max_batch
+        self._pending: Dict[str, Tuple[Dict[str, Any], asyncio.Future]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._dispatches: Set[asyncio.Task] = set()
+        self._request_ids = itertools.count()
+
+    async def completion(
+        self,
+        messages: List[ChatCompletionMessageParam],
+        model: str = "gpt-4o",
+        stream: bool = False,
+        json_mode: bool = False,
+        max_tokens: int = 8096,
+        response_format: Optional[Dict[str, Any]] = None,
+        temperature: Optional[float] = None,
+    ) -> Union[ChatCompletion, AsyncIterator[ChatCompletionChunk]]:
+        """Get completion from OpenAI, batched with concurrent requests.
+
+        Streaming requests bypass the batch. Arguments match
+        OpenAIService.completion.
+        """
+        if stream:
+            return await super().completion(
+                messages, model, stream, json_mode, max_tokens, response_format, temperature
+            )
+
+        if temperature is None and self.cache_enabled:
+            temperature = 0
+        kwargs = {
+            "messages": messages,
+            "model": model,
+            "json_mode": json_mode,
+            "max_tokens": max_tokens,
+            "response_format": response_format,
+            "temperature": temperature,
+        }
+        request = self._request_kwargs(
+            messages, model, stream, json_mode, max_tokens, response_format, temperature
+        )
+        if self._cacheable(request):
+            key = self._cache_key(kwargs)
+        else:
+            # A unique key, so sampled completions are never shared between callers
+            key = f"request-{next(self._request_ids)}"
+        entry = self._pending.get(key)
+        if entry is None:
+            loop = asyncio.get_running_loop()
+            entry = self._pending[key] = (kwargs, loop.create_future())
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        # Shielded so one cancelled caller doesn't cancel the shared result
+        return await asyncio.shield(entry[1])
+
+    def _flush(self) -> None:
+        """Dispatch the pending batch."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: Dict[str, Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        """Send a batch concurrently and resolve each request's future."""
+        logger.debug("Dispatching batch of %d completions", len(batch))
+        results = await asyncio.gather(
+            *(OpenAIService.completion(self, **kwargs) for kwargs, _ in batch.values()),
+            return_exceptions=True,
+        )
+        for (_, future), result in zip(batch.values(), results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
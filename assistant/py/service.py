@@ -1,22 +1,41 @@
 """Assistant service implementing thinking-planning-action loop for AI agents."""
 
-import json
-import uuid
-from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
 
+from .json_utils import parse_json_object
 from .openai_service import OpenAIService
 from .types import (
     Action,
-    ActionResult,
-    Config,
-    Memory,
-    MessageParam,
     State,
     Task,
     Thoughts,
-    Tool,
+    now_iso,
 )
+from .uuid_utils import fast_uuid4
+
+THOUGHT_KEYS = ("environment", "personality", "memory", "tools")
+
+THINK_PROMPT = """Before answering the user, analyze in one pass:
+- environment: the current environment and context: {environment}
+- personality: how your personality affects the response: {personality}
+- memory: which of your memories are relevant:
+{memories}
+- tools: which of your tools might be useful:
+{tools}
+Return a JSON object with one short analysis per key."""
+
+THINK_SCHEMA = {
+    "name": "thoughts",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {key: {"type": "string"} for key in THOUGHT_KEYS},
+        "required": list(THOUGHT_KEYS),
+        "additionalProperties": False,
+    },
+}
 
 
 class AssistantService:
@@ -35,18 +54,39 @@ class AssistantService:
             openai_service: OpenAI service instance. Creates new if not provided.
         """
         self.openai = openai_service or OpenAIService()
-        self.tool_handlers: Dict[str, Callable] = {}
+        # Handlers are stored with whether they are coroutine functions
+        self.tool_handlers: Dict[str, Tuple[Callable[..., Any], bool]] = {}
 
     def register_tool_handler(
-        self, tool_name: str, handler: Callable[[Dict[str, Any]], Dict[str, Any]]
+        self,
+        tool_name: str,
+        handler: Callable[
+            [Dict[str, Any]], Union[Dict[str, Any], Awaitable[Dict[str, Any]]]
+        ],
     ) -> None:
         """Register a handler for a specific tool.
 
         Args:
             tool_name: Name of the tool to handle.
-            handler: Callable that processes the tool.
+            handler: Sync or async callable that processes the tool. Sync
+                handlers run in a worker thread.
         """
-        self.tool_handlers[tool_name] = handler
+        self.tool_handlers[tool_name] = (handler, inspect.iscoroutinefunction(handler))
+
+    async def _run_tool(self, action: Action) -> Dict[str, Any]:
+        """Run the registered handler for an action's tool.
+
+        Args:
+            action: Action whose payload is passed to the handler.
+
+        Returns:
+            Handler result.
+        """
+        handler, is_async = self.tool_handlers[action.tool_name]
+        if is_async:
+            return await handler(action.payload)
+        result = await asyncio.to_thread(handler, action.payload)
+        return await result if inspect.isawaitable(result) else result
 
     async def thinking_phase(
         self, state: State, user_message: str
@@ -67,24 +107,33 @@ class AssistantService:
             Dictionary with thinking results.
         """
         try:
-            # Simplified thinking prompts
-            environment_prompt = f"Analyze the current environment: {state['config']['environment']}"
-            personality_prompt = f"Consider personality: {state['config']['personality']}"
-            memory_prompt = f"Recall relevant memories for: {user_message}"
-            tools_prompt = f"Identify tools needed for: {user_message}"
-
-            results = {
-                "environment": environment_prompt,
-                "personality": personality_prompt,
-                "memory": memory_prompt,
-                "tools": tools_prompt,
-            }
+            # One structured call covers all four analyses
+            config = state.config
+            memories = "\n".join(f"- {m.name}: {m.content}" for m in state.memories)
+            tools = "\n".join(f"- {t.name}: {t.description}" for t in state.tools)
+            response = await self.openai.completion(
+                messages=[
+                    {
+                        "role": "system",
+                        "content": THINK_PROMPT.format(
+                            environment=config.environment,
+                            personality=config.personality,
+                            memories=memories or "none",
+                            tools=tools or "none",
+                        ),
+                    },
+                    {"role": "user", "content": user_message},
+                ],
+                response_format={"type": "json_schema", "json_schema": THINK_SCHEMA},
+            )
+            thoughts = parse_json_object(response.choices[0].message.content)
+            results = {key: thoughts.get(key, "") for key in THOUGHT_KEYS}
 
             print("\n=== Thinking Phase Results ===")
             for key, value in results.items():
                 print(f"{key.capitalize()}: {value}")
 
-            state["thoughts"] = results  # type: ignore
+            state.thoughts = Thoughts(**results)
             return results
 
         except Exception as error:
@@ -99,41 +148,41 @@ class AssistantService:
             user_message: User's input message.
         """
         try:
+            now = now_iso()
+
             # Create initial task
-            task: Task = {
-                "uuid": str(uuid.uuid4()),
-                "conversation_uuid": str(uuid.uuid4()),
-                "status": "pending",
-                "name": f"Task for: {user_message[:50]}",
-                "description": user_message,
-                "actions": [],
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-            }
+            task = Task(
+                uuid=fast_uuid4(),
+                conversation_uuid=fast_uuid4(),
+                status="pending",
+                name=f"Task for: {user_message[:50]}",
+                description=user_message,
+                created_at=now,
+                updated_at=now,
+            )
 
             # Create initial action
-            action: Action = {
-                "uuid": str(uuid.uuid4()),
-                "task_uuid": task["uuid"],
-                "name": "Analyze user request",
-                "tool_name": "memory",
-                "payload": {"query": user_message},
-                "result": None,
-                "status": "pending",
-                "sequence": 0,
-                "description": "Analyze and plan response",
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-            }
-
-            task["actions"].append(action)
-            state["tasks"].append(task)
-            state["config"]["task"] = task["uuid"]
-            state["config"]["action"] = action["uuid"]
+            action = Action(
+                uuid=fast_uuid4(),
+                task_uuid=task.uuid,
+                name="Analyze user request",
+                tool_name="memory",
+                payload={"query": user_message},
+                status="pending",
+                sequence=0,
+                description="Analyze and plan response",
+                created_at=now,
+                updated_at=now,
+            )
+
+            task.actions.append(action)
+            state.tasks.append(task)
+            state.config.task = task.uuid
+            state.config.action = action.uuid
 
             print("\n=== Planning Phase Results ===")
-            print(f"Task: {task['name']}")
-            print(f"Action: {action['name']}")
+            print(f"Task: {task.name}")
+            print(f"Action: {action.name}")
 
         except Exception as error:
             print(f"Error in planning phase: {error}")
@@ -147,36 +196,40 @@ class AssistantService:
             user_message: User's input message.
         """
         try:
-            current_task_uuid = state["config"]["task"]
-            current_action_uuid = state["config"]["action"]
+            current_task_uuid = state.config.task
+            current_action_uuid = state.config.action
 
             if not current_task_uuid or not current_action_uuid:
                 return
 
-            # Find current task and action
+            # Find current task and check the planned action belongs to it
             current_task = next(
-                (t for t in state["tasks"] if t["uuid"] == current_task_uuid), None
+                (t for t in state.tasks if t.uuid == current_task_uuid), None
             )
             if not current_task:
                 return
 
-            current_action = next(
-                (a for a in current_task["actions"] if a["uuid"] == current_action_uuid),
-                None,
-            )
-            if not current_action:
+            if not any(a.uuid == current_action_uuid for a in current_task.actions):
                 return
 
-            # Execute tool if handler exists
-            tool_name = current_action["tool_name"]
-            if tool_name in self.tool_handlers:
-                result = self.tool_handlers[tool_name](current_action["payload"])
-                current_action["result"] = result
-                current_action["status"] = "completed"
+            # Actions of one task are independent, so all pending ones with a
+            # handler run concurrently
+            pending = [
+                a
+                for a in current_task.actions
+                if a.status == "pending" and a.tool_name in self.tool_handlers
+            ]
+            results = await asyncio.gather(*(self._run_tool(a) for a in pending))
+            now = now_iso()
+            for action, result in zip(pending, results):
+                action.result = result
+                action.status = "completed"
+                action.touch(now)
 
             print("\n=== Action Phase Results ===")
-            print(f"Tool: {tool_name}")
-            print(f"Result: {current_action['result']}")
+            for action in pending:
+                print(f"Tool: {action.tool_name}")
+                print(f"Result: {action.result}")
 
         except Exception as error:
             print(f"Error in action phase: {error}")
@@ -195,31 +248,32 @@ class AssistantService:
         Returns:
             Updated state after execution.
         """
-        state["config"]["step"] = 0
-        state["messages"].append({"role": "user", "content": user_message})
+        state.config.step = 0
+        state.messages.append({"role": "user", "content": user_message})
 
         # Thinking phase
         await self.thinking_phase(state, user_message)
 
         # Planning and action loop
-        while state["config"]["step"] < max_iterations:
-            print(f"\n=== Step {state['config']['step'] + 1} ===")
+        while state.config.step < max_iterations:
+            print(f"\n=== Step {state.config.step + 1} ===")
 
             await self.planning_phase(state, user_message)
             await self.action_phase(state, user_message)
 
             # Check if we should continue
-            current_task_uuid = state["config"]["task"]
+            current_task_uuid = state.config.task
             if not current_task_uuid:
                 break
 
             current_task = next(
-                (t for t in state["tasks"] if t["uuid"] == current_task_uuid), None
+                (t for t in state.tasks if t.uuid == current_task_uuid), None
             )
             if current_task:
-                current_task["status"] = "completed"
+                current_task.status = "completed"
+                current_task.touch()
 
-            state["config"]["step"] += 1
+            state.config.step += 1
 
         print("\n=== Loop Complete ===")
         return state
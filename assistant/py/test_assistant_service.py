@@ -0,0 +1,129 @@
+"""Tests for the assistant service."""
+
+import json
+import unittest
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from .assistant_service import AssistantService
+from .types import Config, State, Thoughts, Tool
+
+
+def _completion(content: str) -> SimpleNamespace:
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class _Stream:
+    """Async stream yielding content in small deltas."""
+
+    def __init__(self, content: str, size: int = 5) -> None:
+        self.deltas = [content[i:i + size] for i in range(0, len(content), size)]
+        self.closed = False
+
+    async def __aiter__(self):
+        for delta in self.deltas:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _FakeOpenAI:
+    """Returns a fixed plan for planning requests and a stub analysis otherwise."""
+
+    def __init__(self, plan_content: str) -> None:
+        self.plan_content = plan_content
+        self.calls: List[Dict[str, Any]] = []
+        self.streams: List[_Stream] = []
+
+    async def completion(self, messages: List[Dict[str, str]], **kwargs: Any) -> Any:
+        self.calls.append(kwargs)
+        if kwargs.get("stream"):
+            stream = _Stream(self.plan_content)
+            self.streams.append(stream)
+            return stream
+        return _completion(json.dumps({"result": "analysis"}))
+
+
+def _plan(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "result": {
+            "tasks": [{"name": "answer", "description": "Answer the user"}],
+            "action": {"task_name": "answer", "name": "reply", "tool_name": "final_answer"},
+            "payload": payload,
+        }
+    }
+
+
+def _service(plan_content: str) -> AssistantService:
+    config = Config(
+        max_steps=3,
+        step=0,
+        task=None,
+        action=None,
+        ai_name="Alice",
+        username="Adam",
+        environment="home",
+        personality="curious",
+        tools=[Tool(name="final_answer", description="Answer the user")],
+    )
+    state = State(config=config, thoughts=Thoughts(), tools=config.tools)
+    return AssistantService(state, _FakeOpenAI(plan_content))
+
+
+class PlanningPhaseTest(unittest.IsolatedAsyncioTestCase):
+    async def test_fenced_plan_is_repaired(self) -> None:
+        content = "Here is the plan:\n```json\n" + json.dumps(_plan({"answer": "ok"})) + "\n```"
+        service = _service(content)
+
+        await service.planning_phase("hi")
+
+        [task] = service.state.tasks
+        self.assertEqual(task.name, "answer")
+        self.assertEqual(task.actions[0].tool_name, "final_answer")
+        self.assertEqual(task.actions[0].payload, {"answer": "ok"})
+        self.assertFalse(service.openai.streams[0].closed)
+
+    async def test_stream_without_object_is_cut_early(self) -> None:
+        service = _service("I cannot help with that. " * 40)
+
+        await service.planning_phase("hi")
+
+        self.assertEqual(service.state.tasks, [])
+        self.assertTrue(service.openai.streams[0].closed)
+
+
+class PlanCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def test_reused_plan_gets_fresh_uuids(self) -> None:
+        service = _service(json.dumps(_plan({"answer": "ok"})))
+        await service.planning_phase("Play some music")
+        [first_task] = service.state.tasks
+        first_action = first_task.actions[0]
+        first_action.payload["answer"] = "changed"
+
+        service.state.tasks = []
+        service._conversation_uuid = "next-conversation"
+        await service.planning_phase("  play SOME music ")
+
+        self.assertEqual(len(service.openai.streams), 1)
+        [task] = service.state.tasks
+        action = task.actions[0]
+        self.assertNotEqual(task.uuid, first_task.uuid)
+        self.assertNotEqual(action.uuid, first_action.uuid)
+        self.assertEqual(task.conversation_uuid, "next-conversation")
+        self.assertEqual(action.task_uuid, task.uuid)
+        self.assertEqual(service.state.config.task, task.uuid)
+        self.assertEqual(service.state.config.action, action.uuid)
+        self.assertIs(service._task(task.uuid), task)
+        self.assertEqual(action.payload, {"answer": "ok"})
+
+    async def test_changed_task_list_is_planned_again(self) -> None:
+        service = _service(json.dumps(_plan({"answer": "ok"})))
+        await service.planning_phase("Play some music")
+        await service.planning_phase("Play some music")
+
+        self.assertEqual(len(service.openai.streams), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""Tests for the batching OpenAI service."""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+from .openai_service import BatchingOpenAIService, logger
+
+
+def _messages(content: str) -> List[Dict[str, str]]:
+    return [{"role": "user", "content": content}]
+
+
+class BatchingOpenAIServiceTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.service = BatchingOpenAIService(api_key="test", cache_enabled=True)
+        self.calls: List[Dict[str, Any]] = []
+        self.release = asyncio.Event()
+
+        async def create(**kwargs: Any) -> SimpleNamespace:
+            self.calls.append(kwargs)
+            await self.release.wait()
+            return SimpleNamespace(content=kwargs["messages"][0]["content"])
+
+        self.service.async_client.chat.completions.create = create
+
+    async def asyncTearDown(self) -> None:
+        await self.service.aclose()
+
+    async def test_identical_requests_share_one_call(self) -> None:
+        self.release.set()
+        results = await asyncio.gather(
+            self.service.completion(_messages("a"), temperature=0),
+            self.service.completion(_messages("a"), temperature=0),
+            self.service.completion(_messages("b"), temperature=0),
+        )
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertIs(results[0], results[1])
+        self.assertEqual([r.content for r in results], ["a", "a", "b"])
+
+    async def test_unset_temperature_is_shared_while_caching(self) -> None:
+        self.release.set()
+        first, second = await asyncio.gather(
+            self.service.completion(_messages("a")),
+            self.service.completion(_messages("a")),
+        )
+
+        self.assertIs(first, second)
+        self.assertEqual([call["temperature"] for call in self.calls], [0])
+
+    async def test_sampled_requests_are_not_shared(self) -> None:
+        self.release.set()
+        first, second = await asyncio.gather(
+            self.service.completion(_messages("a"), temperature=0.5),
+            self.service.completion(_messages("a"), temperature=0.5),
+        )
+
+        self.assertEqual(len(self.calls), 2)
+        self.assertIsNot(first, second)
+
+    async def test_requests_are_not_shared_without_cache(self) -> None:
+        self.service.cache_enabled = False
+        self.release.set()
+        results = await asyncio.gather(
+            self.service.completion(_messages("a")),
+            self.service.completion(_messages("a")),
+            self.service.completion(_messages("a"), temperature=0),
+            self.service.completion(_messages("a"), temperature=0),
+        )
+
+        self.assertEqual(len(self.calls), 4)
+        self.assertEqual(len({id(r) for r in results}), 4)
+        self.assertNotIn("temperature", self.calls[0])
+
+    async def test_full_batch_dispatches_early(self) -> None:
+        self.service.max_batch = 2
+        self.service.batch_window = 60
+        self.release.set()
+
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                self.service.completion(_messages("a")),
+                self.service.completion(_messages("b")),
+            ),
+            timeout=1,
+        )
+
+        self.assertEqual([r.content for r in results], ["a", "b"])
+
+    async def test_cancelled_caller_does_not_cancel_shared_request(self) -> None:
+        first = asyncio.create_task(self.service.completion(_messages("a"), temperature=0))
+        second = asyncio.create_task(self.service.completion(_messages("a"), temperature=0))
+        while not self.calls:
+            await asyncio.sleep(0.001)
+
+        first.cancel()
+        self.release.set()
+
+        self.assertEqual((await second).content, "a")
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+        self.assertEqual(len(self.calls), 1)
+
+    async def test_all_callers_cancelled(self) -> None:
+        caller = asyncio.create_task(self.service.completion(_messages("a")))
+        while not self.calls:
+            await asyncio.sleep(0.001)
+
+        caller.cancel()
+        self.release.set()
+        with self.assertRaises(asyncio.CancelledError):
+            await caller
+        await asyncio.gather(*self.service._dispatches)
+
+        # The service keeps working after an abandoned request
+        self.assertEqual((await self.service.completion(_messages("b"))).content, "b")
+
+    async def test_error_reaches_every_caller(self) -> None:
+        async def create(**kwargs: Any) -> None:
+            self.calls.append(kwargs)
+            raise RuntimeError("boom")
+
+        self.service.async_client.chat.completions.create = create
+
+        with self.assertLogs(logger, "ERROR"):
+            results = await asyncio.gather(
+                self.service.completion(_messages("a"), temperature=0),
+                self.service.completion(_messages("a"), temperature=0),
+                return_exceptions=True,
+            )
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,21 +5,30 @@ from typing import Any, Dict, List, Literal, Optional
 from datetime import datetime
 
 
-@dataclass
+def now_iso() -> str:
+    """Return the current local time in ISO format.
+
+    Callers creating or updating several records at once take one value
+    and pass it to each constructor or touch() call.
+    """
+    return datetime.now().isoformat()
+
+
+@dataclass(slots=True)
 class ActionResult:
     """Result of an action execution."""
     status: str
     data: Any
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MemoryCategory:
     """Category for organizing memories."""
     name: str
     description: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Tool:
     """Tool available for the assistant."""
     name: str
@@ -27,7 +36,7 @@ class Tool:
     instruction: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Assistant configuration."""
     max_steps: int
@@ -40,9 +49,11 @@ class Config:
     personality: str
     memory_categories: List[MemoryCategory] = field(default_factory=list)
     tools: List[Tool] = field(default_factory=list)
+    thinking_model: str = "gpt-4o-mini"
+    planning_model: str = "gpt-4o"
 
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     """Action to be executed."""
     uuid: str
@@ -54,11 +65,15 @@ class Action:
     status: Literal["pending", "completed", "failed"] = "pending"
     sequence: int = 0
     description: str = ""
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = field(default_factory=now_iso)
+    updated_at: str = field(default_factory=now_iso)
 
+    def touch(self, now: Optional[str] = None) -> None:
+        """Set updated_at to now, or to the current time if not given."""
+        self.updated_at = now or now_iso()
 
-@dataclass
+
+@dataclass(slots=True)
 class Task:
     """Task to be completed."""
     uuid: str
@@ -67,22 +82,30 @@ class Task:
     description: str
     status: Literal["pending", "completed", "failed"] = "pending"
     actions: List[Action] = field(default_factory=list)
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = field(default_factory=now_iso)
+    updated_at: str = field(default_factory=now_iso)
+
+    def touch(self, now: Optional[str] = None) -> None:
+        """Set updated_at to now, or to the current time if not given."""
+        self.updated_at = now or now_iso()
 
 
-@dataclass
+@dataclass(slots=True)
 class Document:
     """Document stored in the assistant."""
     uuid: str
     conversation_uuid: str
     text: str
     metadata: Dict[str, Any] = field(default_factory=dict)
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = field(default_factory=now_iso)
+    updated_at: str = field(default_factory=now_iso)
+
+    def touch(self, now: Optional[str] = None) -> None:
+        """Set updated_at to now, or to the current time if not given."""
+        self.updated_at = now or now_iso()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Memory:
     """Memory item for the assistant."""
     name: str
@@ -90,7 +113,7 @@ class Memory:
     content: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Thoughts:
     """Thoughts from reasoning phases."""
     environment: str = ""
@@ -99,7 +122,7 @@ class Thoughts:
     tools: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class State:
     """Complete state of the assistant."""
     config: Config
@@ -0,0 +1,20 @@
+"""Fast random UUID strings for task and action ids."""
+import os
+
+# Two-character hex string for every byte value
+_HEX = [format(i, "02x") for i in range(256)]
+
+
+def fast_uuid4() -> str:
+    """Return a random (version 4) UUID in the canonical 8-4-4-4-12 form.
+
+    Formats os.urandom bytes through a byte-to-hex table instead of
+    building a uuid.UUID and converting it with str().
+    """
+    b = os.urandom(16)
+    h = _HEX
+    return (
+        f"{h[b[0]]}{h[b[1]]}{h[b[2]]}{h[b[3]]}-{h[b[4]]}{h[b[5]]}-"
+        f"{h[b[6] & 0x0F | 0x40]}{h[b[7]]}-{h[b[8] & 0x3F | 0x80]}{h[b[9]]}-"
+        f"{h[b[10]]}{h[b[11]]}{h[b[12]]}{h[b[13]]}{h[b[14]]}{h[b[15]]}"
+    )
@@ -1,7 +1,8 @@
 """Audio frontend client for interacting with backend services."""
 
+import mimetypes
+
 import aiohttp
-import io
 from typing import Any, Dict, List, Optional
 
 
@@ -23,6 +24,29 @@ class AudioFrontendClient:
         """
         self.backend_url = backend_url
         self.api_base = f"{backend_url}/api"
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AudioFrontendClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use.
+
+        The session is created lazily because aiohttp binds it to the
+        running event loop.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session and its connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def _fetch_api(
         self,
@@ -49,18 +73,18 @@ class AudioFrontendClient:
         """
         url = f"{self.api_base}/{endpoint}"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.request(
-                method,
-                url,
-                json=json_data,
-                headers=headers,
-                data=data,
-            ) as response:
-                if not response.ok:
-                    text = await response.text()
-                    raise aiohttp.ClientError(f"API error: {text}")
-                return await response.json()
+        session = self._get_session()
+        async with session.request(
+            method,
+            url,
+            json=json_data,
+            headers=headers,
+            data=data,
+        ) as response:
+            if not response.ok:
+                text = await response.text()
+                raise aiohttp.ClientError(f"API error: {text}")
+            return await response.json()
 
     async def transcribe(
         self,
@@ -82,22 +106,27 @@ class AudioFrontendClient:
         try:
             # Create form data
             form_data = aiohttp.FormData()
-            form_data.add_field("file", io.BytesIO(audio_bytes), filename=filename)
+            form_data.add_field(
+                "file",
+                audio_bytes,
+                filename=filename,
+                content_type=mimetypes.guess_type(filename)[0] or "audio/wav",
+            )
             form_data.add_field("model", "whisper-1")
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.api_base}/transcribe",
-                    data=form_data,
-                ) as response:
-                    if not response.ok:
-                        raise ValueError(f"Transcription failed: {response.status}")
-                    result = await response.json()
-                    transcription = result.get("transcription")
-                    if not transcription:
-                        raise ValueError("No transcription in response")
-                    print(f"Transcription received: {transcription}")
-                    return transcription
+            session = self._get_session()
+            async with session.post(
+                f"{self.api_base}/transcribe",
+                data=form_data,
+            ) as response:
+                if not response.ok:
+                    raise ValueError(f"Transcription failed: {response.status}")
+                result = await response.json()
+                transcription = result.get("transcription")
+                if not transcription:
+                    raise ValueError("No transcription in response")
+                print(f"Transcription received: {transcription}")
+                return transcription
 
         except Exception as error:
             print(f"Transcription error: {error}")
@@ -119,20 +148,15 @@ class AudioFrontendClient:
             ValueError: If speech synthesis fails.
         """
         try:
-            response = await self._fetch_api(
-                "speakEleven",
-                method="POST",
-                json_data={"text": text},
-            )
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.api_base}/speakEleven",
-                    json={"text": text},
-                ) as resp:
-                    if not resp.ok:
-                        raise ValueError(f"Speech synthesis failed: {resp.status}")
-                    return await resp.read()
+            # The endpoint returns audio bytes, not JSON, so read it directly
+            session = self._get_session()
+            async with session.post(
+                f"{self.api_base}/speakEleven",
+                json={"text": text},
+            ) as resp:
+                if not resp.ok:
+                    raise ValueError(f"Speech synthesis failed: {resp.status}")
+                return await resp.read()
 
         except Exception as error:
             print(f"Speech synthesis error: {error}")
@@ -187,17 +211,17 @@ class AudioFrontendClient:
         """
         try:
             form_data = aiohttp.FormData()
-            form_data.add_field("file", io.BytesIO(audio_bytes), filename="audio.wav")
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.api_base}/transcribe",
-                    data=form_data,
-                ) as response:
-                    if not response.ok:
-                        raise ValueError(f"Transcription failed: {response.status}")
-                    result = await response.json()
-                    return result.get("transcription", "")
+            form_data.add_field("file", audio_bytes, filename="audio.wav", content_type="audio/wav")
+
+            session = self._get_session()
+            async with session.post(
+                f"{self.api_base}/transcribe",
+                data=form_data,
+            ) as response:
+                if not response.ok:
+                    raise ValueError(f"Transcription failed: {response.status}")
+                result = await response.json()
+                return result.get("transcription", "")
 
         except Exception as error:
             print(f"Audio blob transcription error: {error}")
@@ -0,0 +1,72 @@
+"""Tests for the token-aware text splitter."""
+
+import asyncio
+import contextlib
+import io
+import unittest
+
+from .text_service import TextSplitter
+
+TEXT = ''.join(
+    f'Line {i}: zażółć gęślą jaźń, naïve café — {"word " * (i % 7)}\n' for i in range(200)
+)
+
+
+def _splitter() -> TextSplitter:
+    splitter = TextSplitter()
+    splitter._initialize_tokenizer()
+    return splitter
+
+
+class PrefixTokensTest(unittest.TestCase):
+    def test_matches_linear_scan(self) -> None:
+        splitter = _splitter()
+        text = TEXT[:2000]
+        offsets = splitter._char_offsets(splitter.tokenizer.encode_ordinary(text))
+
+        self.assertEqual(offsets[-1], len(text))
+        for length in range(1, len(text) + 1):
+            needed = next(i for i, covered in enumerate(offsets) if covered >= length) + 1
+            self.assertEqual(
+                splitter._prefix_tokens(offsets, length),
+                needed + splitter._format_overhead,
+                length,
+            )
+
+
+class GetChunkTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.splitter = _splitter()
+        # The splitter reports progress with print
+        self.enterContext(contextlib.redirect_stdout(io.StringIO()))
+
+    def test_chunk_fits_limit(self) -> None:
+        for start in (0, 37, 1500):
+            for limit in (60, 150, 400):
+                chunk, end, tokens = self.splitter._get_chunk(TEXT, start, limit)
+
+                self.assertEqual(chunk, TEXT[start:end])
+                self.assertLessEqual(self.splitter._count_tokens(chunk), tokens)
+                self.assertLessEqual(tokens, limit)
+
+    def test_chunk_ends_on_newline(self) -> None:
+        for start in (0, 37, 1500):
+            chunk, _, _ = self.splitter._get_chunk(TEXT, start, 400)
+
+            self.assertTrue(chunk.endswith('\n'), start)
+
+    def test_chunk_at_end_of_text(self) -> None:
+        self.assertEqual(self.splitter._get_chunk(TEXT, len(TEXT), 100), ('', len(TEXT), 0))
+
+        chunk, end, _ = self.splitter._get_chunk(TEXT, len(TEXT) - 10, 100)
+        self.assertEqual((chunk, end), (TEXT[-10:], len(TEXT)))
+
+    def test_split_covers_text(self) -> None:
+        docs = asyncio.run(self.splitter.split(TEXT, 120))
+
+        self.assertEqual(''.join(doc.text for doc in docs), TEXT)
+        self.assertTrue(all(doc.metadata['tokens'] <= 120 for doc in docs))
+
+
+if __name__ == '__main__':
+    unittest.main()
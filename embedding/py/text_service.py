@@ -1,10 +1,52 @@
 """Text splitting and document processing service."""
+import hashlib
 import re
+from bisect import bisect_left
+from collections import OrderedDict
+from functools import lru_cache
 from typing import List, Dict, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 import tiktoken
 
 
+_HEADER_RE = re.compile(r'^(#{1,6})\s+(.*)$', re.MULTILINE)
+_MEDIA_RE = re.compile(r'(!?)\[([^\]]*)]\(([^)]+)\)')
+_PLACEHOLDER_RE = re.compile(r'(!?)\[([^\]]*)]\(\{\{\$(img|url)(\d+)\}\}\)')
+
+
+@lru_cache(maxsize=None)
+def _get_tokenizer(model_name: str) -> Any:
+    """Get a shared tokenizer for model, falling back to cl100k_base."""
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        return tiktoken.get_encoding('cl100k_base')
+
+
+# Maximum number of token counts kept, keyed by a digest of the text
+TOKEN_COUNT_CACHE_SIZE = 8192
+
+_token_counts: 'OrderedDict[Tuple[str, bytes], int]' = OrderedDict()
+
+
+def _cached_token_count(encoding_name: str, text: str) -> int:
+    """Count ordinary (non-special) tokens in text, memoized by content digest.
+
+    Keying on a digest keeps the cache from holding on to every text it
+    has counted.
+    """
+    key = (encoding_name, hashlib.blake2b(text.encode(), digest_size=16).digest())
+    count = _token_counts.get(key)
+    if count is not None:
+        _token_counts.move_to_end(key)
+        return count
+    count = len(tiktoken.get_encoding(encoding_name).encode_ordinary(text))
+    _token_counts[key] = count
+    if len(_token_counts) > TOKEN_COUNT_CACHE_SIZE:
+        _token_counts.popitem(last=False)
+    return count
+
+
 @dataclass
 class IDoc:
     """Document with metadata."""
@@ -29,6 +71,7 @@ class TextSplitter:
         """
         self.model_name = model_name
         self.tokenizer: Optional[Any] = None
+        self._format_overhead = 0
 
     def _initialize_tokenizer(self, model: Optional[str] = None) -> None:
         """Initialize tokenizer for model.
@@ -41,10 +84,9 @@ class TextSplitter:
             self.tokenizer = None
         
         if self.tokenizer is None:
-            try:
-                self.tokenizer = tiktoken.encoding_for_model(self.model_name)
-            except KeyError:
-                self.tokenizer = tiktoken.get_encoding('cl100k_base')
+            self.tokenizer = _get_tokenizer(self.model_name)
+            # Chat template tokens are counted once and added to every count
+            self._format_overhead = len(self.tokenizer.encode_ordinary(self._format_for_tokenization('')))
 
     def _count_tokens(self, text: str) -> int:
         """Count tokens in text.
@@ -58,9 +100,7 @@ class TextSplitter:
         if self.tokenizer is None:
             raise ValueError('Tokenizer not initialized')
         
-        formatted_content = self._format_for_tokenization(text)
-        tokens = self.tokenizer.encode(formatted_content)
-        return len(tokens)
+        return _cached_token_count(self.tokenizer.name, text) + self._format_overhead
 
     def _format_for_tokenization(self, text: str) -> str:
         """Format text for tokenization.
@@ -93,8 +133,7 @@ class TextSplitter:
 
         while position < total_length:
             print(f'Processing chunk starting at position: {position}')
-            chunk_text, chunk_end = self._get_chunk(text, position, limit)
-            tokens = self._count_tokens(chunk_text)
+            chunk_text, chunk_end, tokens = self._get_chunk(text, position, limit)
             print(f'Chunk tokens: {tokens}')
 
             headers_in_chunk = self._extract_headers(chunk_text)
@@ -118,7 +157,7 @@ class TextSplitter:
         print(f'Split process completed. Total chunks: {len(chunks)}')
         return chunks
 
-    def _get_chunk(self, text: str, start: int, limit: int) -> Tuple[str, int]:
+    def _get_chunk(self, text: str, start: int, limit: int) -> Tuple[str, int, int]:
         """Get next chunk respecting token limit.
         
         Args:
@@ -127,39 +166,44 @@ class TextSplitter:
             limit: Token limit.
         
         Returns:
-            Tuple of (chunk_text, chunk_end_position).
+            Tuple of (chunk_text, chunk_end_position, token_count).
         """
         print(f'Getting chunk starting at {start} with limit {limit}')
         
-        # Estimate end position
-        remaining_text = text[start:]
-        if len(remaining_text) == 0:
-            return '', start
+        if start >= len(text):
+            return '', start, 0
         
-        # Conservative estimate: rough characters per token ratio
-        chars_per_token = len(remaining_text) / self._count_tokens(remaining_text)
-        estimated_end = start + int(limit * chars_per_token * 0.9)  # 90% to be safe
-        estimated_end = min(estimated_end, len(text))
+        # Encode a window large enough to overfill the budget, growing it only when needed
+        budget = max(1, limit - self._format_overhead)
+        window = max(256, budget * 8)
+        while True:
+            token_ids = self.tokenizer.encode_ordinary(text[start:start + window])
+            if len(token_ids) > budget + 1 or start + window >= len(text):
+                break
+            window *= 2
         
-        chunk_text = text[start:estimated_end]
-        tokens = self._count_tokens(chunk_text)
-        
-        # Adjust if over limit
-        while tokens > limit and estimated_end > start:
-            print(f'Chunk exceeds limit with {tokens} tokens. Adjusting end position...')
-            estimated_end = self._find_new_chunk_end(text, start, estimated_end)
-            chunk_text = text[start:estimated_end]
-            tokens = self._count_tokens(chunk_text)
+        # Character offsets per token let every candidate end be counted by index
+        char_offsets = self._char_offsets(token_ids)
+        fit = min(budget, len(token_ids))
+        estimated_end = start + max(1, char_offsets[fit - 1])
+        tokens = fit + self._format_overhead
         
         # Align with newlines
-        estimated_end = self._adjust_chunk_end(text, start, estimated_end, tokens, limit)
+        estimated_end, tokens = self._adjust_chunk_end(text, start, estimated_end, tokens, limit, char_offsets)
         chunk_text = text[start:estimated_end]
-        tokens = self._count_tokens(chunk_text)
         print(f'Final chunk end: {estimated_end}')
         
-        return chunk_text, estimated_end
+        return chunk_text, estimated_end, tokens
 
-    def _adjust_chunk_end(self, text: str, start: int, end: int, current_tokens: int, limit: int) -> int:
+    def _adjust_chunk_end(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        current_tokens: int,
+        limit: int,
+        char_offsets: List[int]
+    ) -> Tuple[int, int]:
         """Adjust chunk end to align with newlines.
         
         Args:
@@ -168,49 +212,64 @@ class TextSplitter:
             end: Current end.
             current_tokens: Current token count.
             limit: Token limit.
+            char_offsets: Complete characters covered after each token from start.
         
         Returns:
-            Adjusted end position.
+            Tuple of (adjusted_end_position, token_count).
         """
         min_chunk_tokens = limit * 0.8  # Minimum 80% of limit
 
         # Try extending to next newline
         next_newline = text.find('\n', end)
-        if next_newline != -1 and next_newline < len(text):
+        if next_newline != -1 and next_newline - start < char_offsets[-1]:
             extended_end = next_newline + 1
-            chunk_text = text[start:extended_end]
-            tokens = self._count_tokens(chunk_text)
+            tokens = self._prefix_tokens(char_offsets, extended_end - start)
             if tokens <= limit and tokens >= min_chunk_tokens:
                 print(f'Extending chunk to next newline at position {extended_end}')
-                return extended_end
+                return extended_end, tokens
 
         # Try reducing to previous newline
         prev_newline = text.rfind('\n', start, end)
         if prev_newline > start:
             reduced_end = prev_newline + 1
-            chunk_text = text[start:reduced_end]
-            tokens = self._count_tokens(chunk_text)
+            tokens = self._prefix_tokens(char_offsets, reduced_end - start)
             if tokens <= limit and tokens >= min_chunk_tokens:
                 print(f'Reducing chunk to previous newline at position {reduced_end}')
-                return reduced_end
+                return reduced_end, tokens
 
-        return end
+        return end, current_tokens
 
-    def _find_new_chunk_end(self, text: str, start: int, end: int) -> int:
-        """Find new chunk end by reducing by 10%.
+    def _prefix_tokens(self, char_offsets: List[int], length: int) -> int:
+        """Count tokens needed to cover the first length characters of a chunk."""
+        return bisect_left(char_offsets, length) + 1 + self._format_overhead
+
+    def _char_offsets(self, token_ids: List[int]) -> List[int]:
+        """Count complete characters covered after each token.
         
         Args:
-            text: Full text.
-            start: Chunk start.
-            end: Current end.
+            token_ids: Tokens of the text starting at the chunk start.
         
         Returns:
-            New end position.
+            Cumulative character counts, one per token.
         """
-        new_end = end - max(1, (end - start) // 10)
-        if new_end <= start:
-            new_end = start + 1
-        return new_end
+        offsets: List[int] = []
+        chars = 0
+        pending = 0  # UTF-8 continuation bytes still expected
+        for token_bytes in self.tokenizer.decode_tokens_bytes(token_ids):
+            if pending == 0 and token_bytes.isascii():
+                chars += len(token_bytes)
+            else:
+                for byte in token_bytes:
+                    if byte < 0x80:
+                        chars += 1
+                    elif byte >= 0xC0:
+                        pending = 1 if byte < 0xE0 else 2 if byte < 0xF0 else 3
+                    else:
+                        pending -= 1
+                        if pending == 0:
+                            chars += 1
+            offsets.append(chars)
+        return offsets
 
     def _extract_headers(self, text: str) -> Dict[str, List[str]]:
         """Extract markdown headers from text.
@@ -222,15 +281,9 @@ class TextSplitter:
             Dict mapping header level (h1-h6) to list of headers.
         """
         headers: Dict[str, List[str]] = {}
-        header_regex = r'^(#{1,6})\s+(.*)$'
         
-        for match in re.finditer(header_regex, text, re.MULTILINE):
-            level = len(match.group(1))
-            content = match.group(2).strip()
-            key = f'h{level}'
-            if key not in headers:
-                headers[key] = []
-            headers[key].append(content)
+        for match in _HEADER_RE.finditer(text):
+            headers.setdefault(f'h{len(match.group(1))}', []).append(match.group(2).strip())
 
         return headers
 
@@ -241,11 +294,13 @@ class TextSplitter:
             current: Current headers dict (modified in place).
             extracted: Extracted headers dict.
         """
-        for level in range(1, 7):
-            key = f'h{level}'
-            if key in extracted:
-                current[key] = extracted[key]
-                self._clear_lower_headers(current, level)
+        if not extracted:
+            return
+
+        # Headers below the highest extracted level are stale unless re-extracted
+        top_level = min(int(key[1:]) for key in extracted)
+        self._clear_lower_headers(current, top_level)
+        current.update(extracted)
 
     def _clear_lower_headers(self, headers: Dict[str, List[str]], level: int) -> None:
         """Clear headers below given level.
@@ -268,34 +323,53 @@ class TextSplitter:
         """
         urls: List[str] = []
         images: List[str] = []
-        url_index = 0
-        image_index = 0
-
-        # Extract images: ![alt](url)
-        def replace_image(match):
-            nonlocal image_index
-            alt_text = match.group(1)
-            url = match.group(2)
-            images.append(url)
-            replacement = f'![{alt_text}]({{{{$img{image_index}}}}})'  
-            image_index += 1
-            return replacement
-
-        # Extract links: [text](url)
-        def replace_url(match):
-            nonlocal url_index
-            link_text = match.group(1)
-            url = match.group(2)
+
+        # Images ![alt](url) and links [text](url) are replaced in one pass
+        def replace_media(match):
+            bang, label, url = match.groups()
+            if bang:
+                images.append(url)
+                return f'![{label}]({{{{$img{len(images) - 1}}}}})'
+            if not label:
+                return match.group(0)
             urls.append(url)
-            replacement = f'[{link_text}]({{{{$url{url_index}}}}})'  
-            url_index += 1
-            return replacement
+            return f'[{label}]({{{{$url{len(urls) - 1}}}}})'
 
-        content = re.sub(r'!\[([^\]]*)]\(([^)]+)\)', replace_image, text)
-        content = re.sub(r'\[([^\]]+)]\(([^)]+)\)', replace_url, content)
+        content = _MEDIA_RE.sub(replace_media, text)
 
         return content, urls, images
 
+    def restore_placeholders(self, doc: IDoc) -> IDoc:
+        """Restore URL and image placeholders with their original values.
+        
+        Args:
+            doc: Document with placeholders in text.
+        
+        Returns:
+            Document with restored URLs and images.
+        """
+        lookup = {
+            'img': doc.metadata.get('images') or [],
+            'url': doc.metadata.get('urls') or [],
+        }
+        if not lookup['img'] and not lookup['url']:
+            return IDoc(text=doc.text, metadata=doc.metadata)
+
+        def restore(match):
+            bang, link_text, kind, index = match.groups()
+            values = lookup[kind]
+            index = int(index)
+            if index >= len(values) or (kind == 'img' and not bang):
+                return match.group(0)
+            if kind == 'url':
+                # Escape underscores in the link text
+                link_text = link_text.replace('_', '\\_')
+            return f'{bang}[{link_text}]({values[index]})'
+
+        content = _PLACEHOLDER_RE.sub(restore, doc.text)
+
+        return IDoc(text=content, metadata=doc.metadata)
+
     async def document(
         self,
         text: str,